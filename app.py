@@ -1,5 +1,6 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from io import BytesIO
@@ -13,6 +14,15 @@ from reportlab.lib import colors
 from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
 import json
 import os
+import re
+import hashlib
+import functools
+import threading
+import tempfile
+import logging
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 try:
     from google.auth.transport.requests import Request
     from google.oauth2.credentials import Credentials
@@ -23,6 +33,24 @@ try:
 except ImportError:
     GOOGLE_APIS_AVAILABLE = False
 
+try:
+    import openpyxl
+    OPENPYXL_AVAILABLE = True
+except ImportError:
+    OPENPYXL_AVAILABLE = False
+
+try:
+    import python_calamine
+    CALAMINE_AVAILABLE = True
+except ImportError:
+    CALAMINE_AVAILABLE = False
+
+try:
+    import pyarrow
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
 try:
     from docx import Document
     from docx.shared import Inches
@@ -32,6 +60,8 @@ try:
 except ImportError:
     DOCX_AVAILABLE = False
 
+logger = logging.getLogger(__name__)
+
 def add_custom_css():
     """Add custom CSS for Typeform-like styling"""
     st.markdown("""
@@ -683,37 +713,95 @@ def create_step_indicator(current_step):
     step_html += '</div>'
     st.markdown(step_html, unsafe_allow_html=True)
 
+# Built-in team/section registry. Keywords are matched as case-insensitive
+# substrings of the filename; earlier teams and keywords win over later ones.
+# Point SURVEY_TEAM_REGISTRY at a JSON file with the same shape to replace it;
+# without a 'sections' list the built-in sections are kept.
+DEFAULT_TEAM_REGISTRY = {
+    'teams': [
+        {'name': "Andrew's Team", 'keywords': ['andrew']},
+        {'name': 'Build Team', 'keywords': ['build']},
+        {'name': 'People and Marketing Team', 'keywords': ['people', 'marketing', 'hr']},
+        {'name': 'Finance and Operations Team', 'keywords': ['operations', 'finance']}
+    ],
+    'sections': [
+        {'name': 'Comments', 'keywords': ['comment', 'feedback', 'response']},
+        {'name': 'Themes', 'keywords': ['theme', 'topic', 'category']},
+        {'name': 'Questions', 'keywords': ['question', 'survey', 'form']}
+    ]
+}
+
+# Sections the analysis views know how to show
+SECTIONS = ['Themes', 'Questions', 'Comments']
+
+def compile_keyword_matcher(groups, whole_words=False):
+    """Compile {'name', 'keywords'} groups into one alternation regex and a keyword -> (priority, name) lookup"""
+    lookup = {}
+    for group in groups:
+        for keyword in group['keywords']:
+            lookup.setdefault(str(keyword).lower(), (len(lookup), group['name']))
+
+    if not lookup:
+        return None, lookup
+
+    # The lookahead reports a match at every position, so overlapping keywords are
+    # all seen; alternatives are in priority order so each position yields its best
+    alternation = '|'.join(re.escape(keyword) for keyword in lookup)
+    if whole_words:
+        return re.compile(rf"(?=\b({alternation})\b)"), lookup
+    return re.compile(f"(?=({alternation}))"), lookup
+
+def load_team_registry(path=None):
+    """Load the team/section registry from a JSON config, or the built-in default"""
+    registry = DEFAULT_TEAM_REGISTRY
+    if path:
+        with open(path) as registry_file:
+            registry = json.load(registry_file)
+
+    # A config may list only teams; files are then sectioned by the built-in keywords
+    section_groups = registry.get('sections', DEFAULT_TEAM_REGISTRY['sections'])
+    teams = [team['name'] for team in registry.get('teams', [])]
+    sections = [section['name'] for section in section_groups]
+    if not sections:
+        raise ValueError(f"No sections in team registry {path}")
+    if len(set(teams)) != len(teams):
+        raise ValueError(f"Duplicate team names in team registry {path}")
+    unknown = [section for section in sections if section not in SECTIONS]
+    if unknown:
+        raise ValueError(f"Unknown sections in team registry {path}: {', '.join(unknown)}")
+
+    team_pattern, team_lookup = compile_keyword_matcher(registry.get('teams', []))
+    team_word_pattern, _ = compile_keyword_matcher(registry.get('teams', []), whole_words=True)
+    section_pattern, section_lookup = compile_keyword_matcher(section_groups)
+    return {
+        'teams': teams,
+        'keywords': {team['name']: list(team['keywords']) for team in registry.get('teams', [])},
+        'team_pattern': team_pattern,
+        'team_word_pattern': team_word_pattern,
+        'team_lookup': team_lookup,
+        'section_pattern': section_pattern,
+        'section_lookup': section_lookup
+    }
+
+TEAM_REGISTRY = load_team_registry(os.environ.get('SURVEY_TEAM_REGISTRY'))
+
+def match_keyword(pattern, lookup, text):
+    """Name of the highest-priority keyword group found in text, or None"""
+    if pattern is None:
+        return None
+    best = min((lookup[match.group(1)] for match in pattern.finditer(text)), default=None)
+    return best[1] if best else None
+
 def categorize_file(filename):
     """Categorize file based on filename patterns"""
     filename_lower = filename.lower()
 
-    # Extract team name with specific team mappings
-    team = None
-    team_mappings = {
-        'andrew': "Andrew's Team",
-        'build': 'Build Team',
-        'people': 'People and Marketing Team',
-        'marketing': 'People and Marketing Team',
-        'hr': 'People and Marketing Team',
-        'operations': 'Finance and Operations Team',
-        'finance': 'Finance and Operations Team'
-    }
-
-    for keyword, team_name in team_mappings.items():
-        if keyword in filename_lower:
-            team = team_name
-            break
-
-    # Determine section/category
-    section = None
-    if any(word in filename_lower for word in ['comment', 'feedback', 'response']):
-        section = 'Comments'
-    elif any(word in filename_lower for word in ['theme', 'topic', 'category']):
-        section = 'Themes'
-    elif any(word in filename_lower for word in ['question', 'survey', 'form']):
-        section = 'Questions'
-    else:
-        # Default to general if no specific category found
+    # Extract team name and section with the registry's compiled matchers
+    team = match_keyword(TEAM_REGISTRY['team_pattern'], TEAM_REGISTRY['team_lookup'], filename_lower)
+    section = match_keyword(TEAM_REGISTRY['section_pattern'], TEAM_REGISTRY['section_lookup'], filename_lower)
+
+    # Default to general if no specific category found
+    if section is None:
         section = 'General'
 
     return {
@@ -722,78 +810,1195 @@ def categorize_file(filename):
         'filename': filename
     }
 
-def load_and_process_multiple_files(uploaded_files):
-    """Load and process multiple survey data files"""
-    # Team-first structure
-    team_data = {
-        "Andrew's Team": {'Themes': [], 'Questions': [], 'Comments': []},
-        'Build Team': {'Themes': [], 'Questions': [], 'Comments': []},
-        'People and Marketing Team': {'Themes': [], 'Questions': [], 'Comments': []},
-        'Finance and Operations Team': {'Themes': [], 'Questions': [], 'Comments': []}
+# Parsed workbook cache limits (shared across reruns and sessions)
+PARSE_CACHE_MAX_ENTRIES = 256
+PARSE_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+# Parallel parsing: worker count (1 disables the pool) and minimum batch size
+PARSE_WORKERS = int(os.environ.get('SURVEY_PARSE_WORKERS', os.cpu_count() or 1))
+PARALLEL_PARSE_MIN_FILES = 4
+
+# Excel reader engine: 'auto' picks calamine when installed, otherwise streams
+# rows with openpyxl in read-only mode. Operators can pin 'calamine',
+# 'openpyxl-stream' or 'openpyxl' (pandas' default reader).
+EXCEL_ENGINES = ['auto', 'calamine', 'openpyxl-stream', 'openpyxl']
+EXCEL_ENGINE = os.environ.get('SURVEY_EXCEL_ENGINE', 'auto')
+
+# Cell strings pandas' Excel reader treats as missing values
+EXCEL_NA_STRINGS = [
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND',
+    '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'
+]
+
+# Comments workbooks at least this large are streamed in chunks, keeping only
+# the affirmation, theme and comment columns
+STREAMING_MIN_BYTES = int(os.environ.get('SURVEY_STREAMING_MIN_BYTES', 20 * 1024 * 1024))
+STREAM_CHUNK_ROWS = 5000
+
+# Header keywords identifying the columns used for comment analysis
+COLUMN_ROLE_KEYWORDS = {
+    'question': ['question', 'affirmation', 'statement', 'item'],
+    'theme': ['theme', 'category', 'domain'],
+    'score': ['score', 'rating', 'value'],
+    'comment': ['comment', 'feedback', 'response', 'text', 'opinion']
+}
+
+# Header names of an in-file team column (e.g. HRIS exports covering every team)
+TEAM_COLUMN_NAMES = ['team', 'team name', 'team_name']
+
+# Columns the question and comment analyzers use; other columns of these sections
+# are never parsed. The first role of each section must be present to prune.
+SECTION_COLUMN_ROLES = {
+    'Questions': ['question', 'theme', 'score'],
+    'Comments': ['comment', 'question', 'theme']
+}
+# Free-text roles are read as-is instead of being type-inferred
+TEXT_COLUMN_ROLES = ['question', 'theme', 'comment']
+# Extra header keywords of the comment columns listed in the comment views
+COMMENT_LIST_KEYWORDS = COLUMN_ROLE_KEYWORDS['comment'] + ['note']
+
+# Explicit column roles, as JSON mapping role to header (e.g. {"comment": "Verbatim"}).
+# They win over keyword detection whenever the sheet has that column.
+def load_column_role_overrides(raw=None):
+    """Parse explicit column roles from their JSON config, rejecting unknown roles"""
+    overrides = json.loads(raw) if raw else {}
+    unknown = [role for role in overrides if role not in COLUMN_ROLE_KEYWORDS]
+    if unknown:
+        raise ValueError(f"Unknown column roles in SURVEY_COLUMN_ROLES: {', '.join(unknown)}")
+    return overrides
+
+COLUMN_ROLE_OVERRIDES = load_column_role_overrides(os.environ.get('SURVEY_COLUMN_ROLES'))
+
+# Arrow-backed strings for free text (missing values stay NaN, as with object columns)
+if PYARROW_AVAILABLE:
+    try:
+        TEXT_DTYPE = pd.StringDtype('pyarrow', na_value=np.nan)
+    except TypeError:
+        # pandas < 2.3 spells the NaN-semantics Arrow string dtype differently
+        TEXT_DTYPE = pd.StringDtype('pyarrow_numpy')
+else:
+    TEXT_DTYPE = None
+
+# Comment corpora at least this large are scored in a process pool, in chunks
+SENTIMENT_WORKERS = int(os.environ.get('SURVEY_SENTIMENT_WORKERS', PARSE_WORKERS))
+PARALLEL_SENTIMENT_MIN_COMMENTS = int(os.environ.get('SURVEY_PARALLEL_SENTIMENT_MIN_COMMENTS', 100000))
+SENTIMENT_CHUNK_COMMENTS = 25000
+
+# Lexicon matches per distinct comment text, shared across reruns and sessions.
+# Ingested comments are scored from their comment index, so this only serves
+# scoring of comments without one (e.g. frames that don't line up with it).
+# Entries are tiny (a hash key and a few counts), so the entry cap is what binds.
+SENTIMENT_CACHE_MAX_ENTRIES = int(os.environ.get('SURVEY_SENTIMENT_CACHE_ENTRIES', 200000))
+SENTIMENT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+SENTIMENT_CACHE_ENTRY_BYTES = 256
+
+# Consolidated per-section views shared across reruns and sessions
+VIEW_CACHE_MAX_ENTRIES = 64
+VIEW_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+# On-disk columnar cache of cleaned sheets. Bump SHEET_CACHE_VERSION whenever
+# the cleaning in parse_workbook changes so stale entries are discarded.
+SHEET_CACHE_VERSION = 5
+SHEET_CACHE_DIR = os.environ.get(
+    'SURVEY_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'surveyresults')
+)
+SHEET_CACHE_MAX_BYTES = 1024 * 1024 * 1024
+
+def create_lru_cache(max_entries, max_bytes):
+    """Create an empty size-capped LRU cache"""
+    return {
+        'entries': OrderedDict(),
+        'total_bytes': 0,
+        'max_entries': max_entries,
+        'max_bytes': max_bytes,
+        'hits': 0,
+        'misses': 0,
+        'lock': threading.Lock()
     }
 
-    processing_errors = []
-    files_processed = []
+def lru_cache_get(cache, key):
+    """Return a cached value (or None) and mark it as recently used"""
+    with cache['lock']:
+        entry = cache['entries'].get(key)
+        if entry is None:
+            cache['misses'] += 1
+            return None
+        cache['hits'] += 1
+        cache['entries'].move_to_end(key)
+        return entry['value']
+
+def lru_cache_stats(cache):
+    """Entry count, size and hit/miss counters of an LRU cache"""
+    with cache['lock']:
+        return {
+            'entries': len(cache['entries']),
+            'total_bytes': cache['total_bytes'],
+            'hits': cache['hits'],
+            'misses': cache['misses']
+        }
 
-    for uploaded_file in uploaded_files:
+def lru_cache_put(cache, key, value, size):
+    """Store a value, evicting least recently used entries to stay under the caps"""
+    with cache['lock']:
+        previous = cache['entries'].pop(key, None)
+        if previous is not None:
+            cache['total_bytes'] -= previous['size']
+
+        # Never let a single oversized value flush the whole cache
+        if size > cache['max_bytes']:
+            return
+
+        cache['entries'][key] = {'value': value, 'size': size}
+        cache['total_bytes'] += size
+
+        while (len(cache['entries']) > cache['max_entries'] or
+               cache['total_bytes'] > cache['max_bytes']):
+            _, evicted = cache['entries'].popitem(last=False)
+            cache['total_bytes'] -= evicted['size']
+
+@st.cache_resource(show_spinner=False)
+def get_parse_cache():
+    """Get the shared cache of parsed workbooks, keyed by content hash and filename"""
+    return create_lru_cache(PARSE_CACHE_MAX_ENTRIES, PARSE_CACHE_MAX_BYTES)
+
+def get_frame_size(df):
+    """Estimate the in-memory size of a DataFrame in bytes"""
+    return int(df.memory_usage(deep=True).sum())
+
+def get_sheets_size(sheets):
+    """Estimate the in-memory size of a parsed workbook's (df, file_info) sheets"""
+    return sum(get_frame_size(df) for df, _ in sheets)
+
+def get_content_hash(file_bytes):
+    """Hash the raw bytes of an uploaded file"""
+    return hashlib.sha256(file_bytes).hexdigest()
+
+def resolve_excel_engine(file_bytes, engine=None):
+    """Pick the Excel reader engine for a workbook, honouring operator overrides"""
+    requested = engine or EXCEL_ENGINE
+    if requested not in EXCEL_ENGINES:
+        raise ValueError(f"Unknown Excel engine '{requested}'. Choose one of: {', '.join(EXCEL_ENGINES)}")
+
+    if requested == 'calamine' and not CALAMINE_AVAILABLE:
+        raise ValueError("Excel engine 'calamine' requested but python-calamine is not installed")
+    if requested != 'auto':
+        return requested
+
+    if CALAMINE_AVAILABLE:
+        return 'calamine'
+    # Only .xlsx workbooks (zip containers) can be streamed with openpyxl
+    if OPENPYXL_AVAILABLE and file_bytes[:2] == b'PK':
+        return 'openpyxl-stream'
+    return 'openpyxl'
+
+def make_header_names(header_cells):
+    """Name header cells the way pandas does (Unnamed: n, deduplicated with .1, .2)"""
+    names = []
+    seen = {}
+    for position, cell in enumerate(header_cells):
+        name = f"Unnamed: {position}" if cell is None or str(cell).strip() == '' else cell
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+def build_column_series(values, dtype=None):
+    """Turn raw streamed cell values into a Series with pandas-like type inference"""
+    series = pd.Series(values, dtype=object)
+    series = series.mask(series.isna() | series.isin(EXCEL_NA_STRINGS))
+    if dtype is not None:
+        return series.astype(dtype)
+
+    # Whole numbers come back as int, so a score column with one text cell is 'mixed-integer'
+    if pd.api.types.infer_dtype(series, skipna=True) in ('string', 'mixed', 'mixed-integer', 'mixed-integer-float'):
+        # Numbers stored as text become numeric, as pd.read_excel does
         try:
-            # Load the Excel file
-            df = pd.read_excel(uploaded_file)
+            return pd.to_numeric(series)
+        except (ValueError, TypeError):
+            return series.infer_objects()
+
+    series = series.infer_objects()
+    if pd.api.types.is_float_dtype(series) and series.notna().all() and (series % 1 == 0).all():
+        series = series.astype('int64')
+    return series
+
+def score_column_match(col, keywords):
+    """How well a header names a role: 1.0 exact, 0.8 whole word, 0.5 substring, 0.0 none"""
+    name = col.strip().lower()
+    best = 0.0
+    for word in keywords:
+        if word not in name:
+            continue
+        if name in (word, word + 's'):
+            return 1.0
+        best = max(best, 0.8 if re.search(rf"(?<![a-z]){word}(?![a-z])", name) else 0.5)
+    return best
+
+@functools.lru_cache(maxsize=1024)
+def resolve_column_schema(columns, overrides=()):
+    """Resolve the column roles of a header once (memoized and shared - never modify the result)"""
+    columns = [str(col) for col in columns]
+    # Overrides are (role, column) pairs, a tuple so the call can be memoized
+    overrides = dict(overrides)
+    roles = {}
+    # 0-1 per role, lower for partial or ambiguous keyword matches
+    confidence = {}
+    for role, keywords in COLUMN_ROLE_KEYWORDS.items():
+        if overrides.get(role) in columns:
+            roles[role], confidence[role] = overrides[role], 1.0
+            continue
 
-            # Clean the data
-            df = df.dropna(how='all').dropna(axis=1, how='all')
-            df.columns = [str(col).strip() for col in df.columns]
+        # Derived columns (e.g. _numeric_Score) never hold raw scores or comments
+        candidates = [(col, score_column_match(col, keywords)) for col in columns
+                      if not (role in ('score', 'comment') and col.startswith('_'))]
+        candidates = [(col, score) for col, score in candidates if score > 0]
+        # The first matching column wins, as in the analyzers' original keyword loops
+        roles[role] = candidates[0][0] if candidates else None
+        confidence[role] = 0.0
+        if candidates:
+            confidence[role] = candidates[0][1] * (1.0 if len(candidates) == 1 else 0.75)
+
+    comment_columns = [col for col in columns if not col.startswith('_') and
+                       any(word in col.lower() for word in COMMENT_LIST_KEYWORDS)]
+    if roles['comment'] and roles['comment'] not in comment_columns:
+        comment_columns.insert(0, roles['comment'])
+
+    return {
+        'columns': tuple(columns),
+        'roles': roles,
+        'confidence': confidence,
+        'comment_columns': comment_columns
+    }
+
+def get_column_schema(df):
+    """Column roles of a frame, resolved once per distinct header"""
+    return resolve_column_schema(tuple(df.columns), tuple(sorted(COLUMN_ROLE_OVERRIDES.items())))
+
+def get_schema_roles(header_names, roles):
+    """The given roles of a header, resolved like the analyzers resolve them"""
+    names = tuple(str(name).strip() for name in header_names)
+    schema = resolve_column_schema(names, tuple(sorted(COLUMN_ROLE_OVERRIDES.items())))
+    return {role: schema['roles'][role] for role in roles}
+
+def describe_schema_column(schema, role):
+    """Detected column of a role for display, flagging uncertain matches"""
+    col = schema['roles'][role]
+    if not col:
+        return '❌ Not found'
+    if schema['confidence'][role] < 1.0:
+        return f"{col} (confidence {schema['confidence'][role]:.0%})"
+    return col
+
+def find_team_column(columns):
+    """Find an in-file team column from a header, or None"""
+    for col in columns:
+        if str(col).strip().lower() in TEAM_COLUMN_NAMES:
+            return col
+    return None
+
+def plan_sheet_columns(header_names, section):
+    """Decide which columns of a sheet to parse from its header row, or None for all"""
+    # The plan holds the kept column positions ('usecols') and the free-text columns' dtypes ('dtype')
+    if section not in SECTION_COLUMN_ROLES:
+        return None
+
+    names = [str(name).strip() for name in header_names]
+    roles = get_schema_roles(names, SECTION_COLUMN_ROLES[section])
+    # Without the main role column the views list every column, so keep them all
+    if not roles[SECTION_COLUMN_ROLES[section][0]]:
+        return None
+
+    text_columns = {roles[role] for role in TEXT_COLUMN_ROLES if roles.get(role)}
+    # An in-file team column is needed to split multi-team exports
+    team_column = find_team_column(names)
+    if team_column:
+        text_columns.add(team_column)
+    kept = set(roles.values()) | text_columns
+    positions = [position for position, name in enumerate(names) if name in kept]
+    return {
+        'usecols': positions,
+        'dtype': {header_names[position]: object for position in positions if names[position] in text_columns}
+    }
+
+def get_sheet_section(filename, sheet_name, sheet_position, sheet_count):
+    """Section a sheet will be filed under, or None when the filename is unknown"""
+    if filename is None:
+        return None
+    return categorize_sheet(filename, sheet_name, sheet_position, sheet_count)['section']
+
+def read_worksheet_streaming(worksheet, section=None):
+    """Read one worksheet by streaming its rows into column lists"""
+    rows = worksheet.iter_rows(values_only=True)
+    header_cells = list(next(rows, ()))
+
+    # Only the role columns of question and comment sheets are kept
+    plan = plan_sheet_columns(make_header_names(header_cells), section)
+    if plan is not None:
+        names = make_header_names(header_cells)
+        positions = plan['usecols']
+        columns = [[] for _ in positions]
+        for row in rows:
+            for column, position in zip(columns, positions):
+                column.append(row[position] if position < len(row) else None)
+
+        selected = [names[position] for position in positions]
+        return pd.DataFrame({name: build_column_series(values, plan['dtype'].get(name))
+                             for name, values in zip(selected, columns)}, columns=selected)
+
+    columns = [[] for _ in header_cells]
+    for row_count, row in enumerate(rows):
+        if len(row) > len(columns):
+            # Data beyond the header row gets unnamed columns, like pandas
+            for _ in range(len(row) - len(columns)):
+                header_cells.append(None)
+                columns.append([None] * row_count)
+        for position, column in enumerate(columns):
+            column.append(row[position] if position < len(row) else None)
+
+    names = make_header_names(header_cells)
+    return pd.DataFrame({name: build_column_series(values) for name, values in zip(names, columns)},
+                        columns=names)
+
+def read_excel_streaming(file_bytes, filename=None, sheet_names=None):
+    """Read every sheet (or only the named ones) by streaming rows from a read-only openpyxl workbook"""
+    workbook = openpyxl.load_workbook(BytesIO(file_bytes), read_only=True, data_only=True)
+    try:
+        worksheets = workbook.worksheets
+        return {
+            worksheet.title: read_worksheet_streaming(
+                worksheet, get_sheet_section(filename, worksheet.title, position, len(worksheets)))
+            for position, worksheet in enumerate(worksheets)
+            if sheet_names is None or worksheet.title in sheet_names
+        }
+    finally:
+        workbook.close()
+
+def read_excel_sheets(workbook, filename=None):
+    """Read every sheet of an open pandas ExcelFile, pruning role-based sections"""
+    sheets = {}
+    for position, sheet_name in enumerate(workbook.sheet_names):
+        section = get_sheet_section(filename, sheet_name, position, len(workbook.sheet_names))
+        plan = None
+        if section in SECTION_COLUMN_ROLES:
+            # Read just the header row first to resolve the role columns
+            plan = plan_sheet_columns(list(workbook.parse(sheet_name, nrows=0).columns), section)
+        sheets[sheet_name] = workbook.parse(sheet_name, **(plan or {}))
+    return sheets
+
+def read_excel_file(file_bytes, engine=None, filename=None):
+    """Read every sheet of a workbook in one open into a dict of sheet name to DataFrame"""
+    # With a filename, question and comment sheets are read header first, then only their role columns
+    selected = resolve_excel_engine(file_bytes, engine)
+
+    if selected == 'calamine':
+        try:
+            with pd.ExcelFile(BytesIO(file_bytes), engine='calamine') as workbook:
+                return read_excel_sheets(workbook, filename)
+        except Exception:
+            # In auto mode fall back to openpyxl when calamine rejects a workbook
+            if (engine or EXCEL_ENGINE) != 'auto' or file_bytes[:2] != b'PK' or not OPENPYXL_AVAILABLE:
+                raise
+            selected = 'openpyxl-stream'
+
+    if selected == 'openpyxl-stream':
+        return read_excel_streaming(file_bytes, filename)
+
+    with pd.ExcelFile(BytesIO(file_bytes)) as workbook:
+        return read_excel_sheets(workbook, filename)
+
+def get_workbook_sheet_names(file_bytes):
+    """Sheet names of an .xlsx workbook, without reading any rows"""
+    workbook = openpyxl.load_workbook(BytesIO(file_bytes), read_only=True, data_only=True)
+    try:
+        return workbook.sheetnames
+    finally:
+        workbook.close()
+
+def iter_excel_chunks(file_bytes, chunk_rows=STREAM_CHUNK_ROWS, select_columns=None, sheet_name=None):
+    """Stream one sheet (the first by default) of an .xlsx workbook as DataFrame chunks"""
+    # select_columns maps the header names to keep to their dtype (None to infer it),
+    # so only those cells are held in memory
+    workbook = openpyxl.load_workbook(BytesIO(file_bytes), read_only=True, data_only=True)
+    try:
+        worksheet = workbook.worksheets[0] if sheet_name is None else workbook[sheet_name]
+        rows = worksheet.iter_rows(values_only=True)
+        names = [str(name).strip() for name in make_header_names(list(next(rows, ())))]
+        keep = select_columns(names) if select_columns else dict.fromkeys(names)
+        positions = [position for position, name in enumerate(names) if name in keep]
+        if not positions:
+            return
+
+        selected = [names[position] for position in positions]
+        columns = [[] for _ in positions]
+        for row in rows:
+            for column, position in zip(columns, positions):
+                column.append(row[position] if position < len(row) else None)
+
+            if len(columns[0]) >= chunk_rows:
+                yield pd.DataFrame({name: build_column_series(values, keep[name])
+                                    for name, values in zip(selected, columns)})
+                columns = [[] for _ in positions]
+
+        if columns[0]:
+            yield pd.DataFrame({name: build_column_series(values, keep[name])
+                                for name, values in zip(selected, columns)})
+    finally:
+        workbook.close()
+
+def parse_comments_streaming(file_bytes, chunk_rows=STREAM_CHUNK_ROWS, sheet_name=None):
+    """Stream a large comments workbook into its role columns and mergeable sentiment counts"""
+    roles = {}
+
+    def select_role_columns(names):
+        roles.update(get_schema_roles(names, SECTION_COLUMN_ROLES['Comments']))
+        if not roles['comment']:
+            return {}
+        # Text columns keep their raw values, as in plan_sheet_columns, so a chunk of
+        # numeric-looking comments or themes is not inferred as numbers
+        team_columns = [col for col in [find_team_column(names)] if col]
+        text_columns = {roles[role] for role in TEXT_COLUMN_ROLES if roles.get(role)} | set(team_columns)
+        kept = [col for col in roles.values() if col] + team_columns
+        return {col: object if col in text_columns else None for col in kept}
+
+    compact_chunks = []
+    sentiment_partials = []
+    for chunk in iter_excel_chunks(file_bytes, chunk_rows, select_role_columns, sheet_name):
+        chunk = chunk.dropna(how='all')
+        comments = chunk[roles['comment']]
+        comments = comments[comments.notna()].astype(str).str.strip()
+        # This may run in a parse pool worker, which must not use the shared sentiment cache
+        sentiment_partials.append(score_sentiment_partial(comments[comments != ''], shared_cache=False))
+        compact_chunks.append(chunk)
+
+    if not roles.get('comment'):
+        raise ValueError("No comment column found for streaming ingestion")
+
+    columns = list(dict.fromkeys(col for col in roles.values() if col))
+    df = pd.concat(compact_chunks, ignore_index=True) if compact_chunks else pd.DataFrame(columns=columns)
+    df = compact_sheet(df.dropna(axis=1, how='all'))
+
+    return df, merge_sentiment_partials(sentiment_partials)
+
+def should_stream_workbook(file_bytes, filename):
+    """Whether a workbook is a large comments export that should be streamed"""
+    return (OPENPYXL_AVAILABLE and file_bytes[:2] == b'PK' and
+            len(file_bytes) >= STREAMING_MIN_BYTES and
+            categorize_file(filename)['section'] == 'Comments')
+
+def parse_workbook_job(file_bytes, engine=None, streaming=False, filename=None):
+    """Parse one workbook into a list of (sheet_name, cleaned df, sentiment counts)"""
+    if streaming:
+        sheet_names = get_workbook_sheet_names(file_bytes)
+        comment_sheets = [sheet_name for position, sheet_name in enumerate(sheet_names)
+                          if get_sheet_section(filename, sheet_name, position, len(sheet_names)) == 'Comments']
+        try:
+            # Only a single comments sheet is streamed; other layouts get a full parse
+            if len(comment_sheets) != 1:
+                raise ValueError("No single comments sheet to stream")
+            df, sentiment = parse_comments_streaming(file_bytes, sheet_name=comment_sheets[0])
+        except ValueError:
+            # No recognizable comment column - fall back to a full parse
+            pass
+        else:
+            if len(sheet_names) == 1:
+                return [(None, df, sentiment)]
+            # The workbook's other sheets (themes, questions) are read as usual
+            others = read_excel_streaming(file_bytes, filename,
+                                          [name for name in sheet_names if name != comment_sheets[0]])
+            return [(sheet_name, df, sentiment) if sheet_name == comment_sheets[0]
+                    else (sheet_name, clean_sheet(others[sheet_name]), None)
+                    for sheet_name in sheet_names]
+    return [(sheet_name, df, None) for sheet_name, df in parse_workbook(file_bytes, engine, filename)]
+
+def clean_sheet(df):
+    """Drop empty rows and columns and normalize column names"""
+    df = df.dropna(how='all').dropna(axis=1, how='all')
+    df.columns = [str(col).strip() for col in df.columns]
+    return compact_sheet(df)
+
+def get_numeric_score_column(score_col):
+    """Name of the float32 column precomputed at ingest from a score column"""
+    return f"_numeric_{score_col}"
+
+def get_numeric_scores(df, score_col):
+    """Numeric scores for a score column, reusing the column precomputed at ingest"""
+    numeric_col = get_numeric_score_column(score_col)
+    if numeric_col in df.columns:
+        return df[numeric_col]
+    return pd.to_numeric(df[score_col], errors='coerce')
+
+def compact_sheet(df):
+    """Normalize a cleaned sheet's dtypes once at ingest"""
+    # Adds a float32 numeric score companion (see get_numeric_scores), makes theme and team columns
+    # categorical and free text Arrow-backed; derived columns are shared, so never write to them
+    roles = get_column_schema(df)['roles']
+    columns = {}
+
+    if roles['score']:
+        columns[get_numeric_score_column(roles['score'])] = (
+            pd.to_numeric(df[roles['score']], errors='coerce').astype('float32')
+        )
+
+    # Only pure text columns are converted; mixed columns keep their raw values
+    def is_text(col):
+        return pd.api.types.infer_dtype(df[col], skipna=True) == 'string'
+
+    for col in [roles['theme'], find_team_column(df.columns)]:
+        if col and is_text(col):
+            columns[col] = df[col].astype('category')
+    if TEXT_DTYPE is not None:
+        for col in [roles['question'], roles['comment']]:
+            if col and col not in columns and is_text(col):
+                columns[col] = df[col].astype(TEXT_DTYPE)
+
+    return df.assign(**columns) if columns else df
+
+def concat_frames(frames):
+    """Concatenate frames, keeping columns categorical when every frame has them so"""
+    combined = pd.concat(frames, ignore_index=True)
+    for col in combined.columns:
+        dtypes = [df[col].dtype for df in frames if col in df.columns]
+        if (combined[col].dtype != 'category' and
+                all(isinstance(dtype, pd.CategoricalDtype) for dtype in dtypes)):
+            combined[col] = combined[col].astype('category')
+    return combined
+
+def parse_workbook(file_bytes, engine=None, filename=None):
+    """Parse every sheet of a workbook into a list of (sheet_name, cleaned df)"""
+    # Load all sheets of the Excel file in a single pass
+    sheets = read_excel_file(file_bytes, engine, filename)
+
+    # Clean the data
+    return [(sheet_name, clean_sheet(df)) for sheet_name, df in sheets.items()]
+
+def categorize_sheet(filename, sheet_name, sheet_position, sheet_count):
+    """Categorize one sheet, using its sheet name in multi-sheet workbooks"""
+    file_info = categorize_file(filename)
+    file_info['sheet'] = sheet_name
+
+    if sheet_count > 1 and sheet_name is not None:
+        sheet_info = categorize_file(str(sheet_name))
+        if sheet_info['team']:
+            file_info['team'] = sheet_info['team']
+
+        if sheet_info['section'] != 'General':
+            file_info['section'] = sheet_info['section']
+        elif sheet_position > 0:
+            # Only the first sheet inherits the section implied by the filename
+            file_info['section'] = 'General'
+
+    return file_info
+
+def add_file_metadata(sheets, filename):
+    """Categorize (sheet_name, df, sentiment) sheets and tag each df with its file metadata"""
+    tagged = []
+    for sheet_position, (sheet_name, df, sentiment) in enumerate(sheets):
+        file_info = categorize_sheet(filename, sheet_name, sheet_position, len(sheets))
+        if sentiment is not None:
+            file_info['sentiment'] = sentiment
+
+        # Add metadata to dataframe
+        source = filename if len(sheets) == 1 else f"{filename} [{sheet_name}]"
+        df = df.copy(deep=False)
+        df['_source_file'] = source
+        df['_detected_team'] = pd.Categorical([file_info['team']] * len(df))
+        df['_file_section'] = pd.Categorical([file_info['section']] * len(df))
+        tagged.append((df, file_info))
+
+    return tagged
+
+def get_sheet_cache_path(cache_id, suffix='parquet'):
+    """Path of an on-disk cache file for a workbook's cleaned sheets"""
+    return os.path.join(SHEET_CACHE_DIR, f"v{SHEET_CACHE_VERSION}", f"{cache_id}.{suffix}")
+
+def load_cached_sheets(cache_id):
+    """Load a workbook's cleaned sheets from the on-disk cache, or None on a miss"""
+    if not PYARROW_AVAILABLE or not SHEET_CACHE_DIR:
+        return None
+
+    manifest_path = get_sheet_cache_path(cache_id, 'json')
+    if not os.path.exists(manifest_path):
+        return None
+
+    try:
+        with open(manifest_path) as manifest_file:
+            sheet_names = json.load(manifest_file)['sheets']
+
+        sheets = []
+        for position, sheet_name in enumerate(sheet_names):
+            path = get_sheet_cache_path(f"{cache_id}.{position}")
+            sheets.append((sheet_name, pd.read_parquet(path), None))
+            # Refresh the access time used for LRU eviction
+            os.utime(path, None)
+        os.utime(manifest_path, None)
+        return sheets
+    except Exception:
+        # Unreadable or partially evicted entry - drop the manifest so it is rebuilt
+        try:
+            os.remove(manifest_path)
+        except OSError:
+            pass
+        return None
+
+def write_cache_file(path, write):
+    """Write a cache file via a temporary file so readers never see partial entries"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def save_cached_sheets(cache_id, sheets):
+    """Persist a workbook's cleaned sheets to the on-disk cache, logging failures"""
+    if not PYARROW_AVAILABLE or not SHEET_CACHE_DIR:
+        return
+
+    # A skip marker records sheets that could not be stored, so they are not retried
+    skip_path = get_sheet_cache_path(cache_id, 'skip')
+    if os.path.exists(skip_path):
+        return
+
+    try:
+        os.makedirs(os.path.dirname(get_sheet_cache_path(cache_id)), exist_ok=True)
+        for position, (_, df, _) in enumerate(sheets):
+            write_cache_file(get_sheet_cache_path(f"{cache_id}.{position}"),
+                             lambda path, df=df: df.to_parquet(path, engine='pyarrow'))
+
+        # The manifest is written last, so it only exists once every sheet is stored
+        def write_manifest(path):
+            with open(path, 'w') as manifest_file:
+                json.dump({'sheets': [sheet_name for sheet_name, _, _ in sheets]}, manifest_file)
+
+        write_cache_file(get_sheet_cache_path(cache_id, 'json'), write_manifest)
+    except Exception as e:
+        # Columns with mixed Excel types (e.g. numbers and free text) cannot be stored as Arrow
+        logger.warning("Not caching sheets of %s on disk: %s", cache_id, e)
+        try:
+            write_cache_file(skip_path, lambda path: open(path, 'w').close())
+        except OSError:
+            pass
+
+def enforce_sheet_cache_budget():
+    """Drop stale cache versions and evict least recently used entries over budget"""
+    if not PYARROW_AVAILABLE or not SHEET_CACHE_DIR or not os.path.isdir(SHEET_CACHE_DIR):
+        return
+
+    current_dir = f"v{SHEET_CACHE_VERSION}"
+    entries = []
+    try:
+        for version_dir in os.listdir(SHEET_CACHE_DIR):
+            version_path = os.path.join(SHEET_CACHE_DIR, version_dir)
+            if not os.path.isdir(version_path):
+                continue
+            for name in os.listdir(version_path):
+                path = os.path.join(version_path, name)
+                if version_dir != current_dir:
+                    os.remove(path)
+                    continue
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, stat.st_size, path))
+            if version_dir != current_dir:
+                os.rmdir(version_path)
+
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_bytes <= SHEET_CACHE_MAX_BYTES:
+                break
+            os.remove(path)
+            total_bytes -= size
+    except OSError:
+        # Another session may be cleaning up concurrently
+        pass
+
+def parse_files_in_pool(jobs, max_workers, engine=None):
+    """Parse (file_bytes, filename, streaming) jobs in a process pool, returning results in job order"""
+    # Jobs left unfinished because a worker died (e.g. killed for memory) get None
+    results = [None] * len(jobs)
+    with ProcessPoolExecutor(max_workers=min(max_workers, len(jobs))) as executor:
+        futures = {
+            executor.submit(parse_workbook_job, file_bytes, engine, streaming, filename): index
+            for index, (file_bytes, filename, streaming) in enumerate(jobs)
+        }
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                results[index] = future.result()
+            except BrokenProcessPool:
+                # Not this file's failure; the caller re-parses it serially
+                pass
+            except Exception as e:
+                results[index] = e
+    return results
+
+def parse_uploaded_files(uploaded_files, parallel=None, engine=None, content_hashes=None):
+    """Parse uploaded files, reusing cached results and parallelizing the rest"""
+    # Returns per file, in upload order, a list of (df, file_info) per sheet or an Exception
+    cache = get_parse_cache()
+    results = [None] * len(uploaded_files)
+    pending = []
+
+    for index, uploaded_file in enumerate(uploaded_files):
+        try:
+            file_bytes = uploaded_file.getvalue()
+            content_hash = content_hashes[index] if content_hashes and content_hashes[index] else None
+            cache_key = (content_hash or get_content_hash(file_bytes), uploaded_file.name)
+        except Exception as e:
+            results[index] = e
+            continue
+
+        cached = lru_cache_get(cache, cache_key)
+        if cached is not None:
+            results[index] = cached
+            continue
+
+        # Large comment exports are streamed; their compact frames are cached separately.
+        # Column pruning depends on the section the filename implies, so it is part of the id.
+        streaming = should_stream_workbook(file_bytes, uploaded_file.name)
+        section_tag = 'stream' if streaming else categorize_file(uploaded_file.name)['section'].lower()
+        cache_id = f"{cache_key[0]}-{section_tag}"
+        if COLUMN_ROLE_OVERRIDES:
+            # Overridden roles change which columns are kept and how they are typed
+            cache_id += '-' + get_content_hash(json.dumps(COLUMN_ROLE_OVERRIDES, sort_keys=True).encode())[:12]
+
+        # A previous session may already have stored the cleaned sheets on disk
+        cached_sheets = load_cached_sheets(cache_id)
+        if cached_sheets is not None:
+            results[index] = add_file_metadata(cached_sheets, uploaded_file.name)
+            lru_cache_put(cache, cache_key, results[index], get_sheets_size(results[index]))
+        else:
+            pending.append((index, cache_key, cache_id, file_bytes, uploaded_file.name, streaming))
+
+    if parallel is None:
+        parallel = PARSE_WORKERS > 1 and len(pending) >= PARALLEL_PARSE_MIN_FILES
+
+    jobs = [(file_bytes, filename, streaming) for _, _, _, file_bytes, filename, streaming in pending]
+    parsed = None
+    if parallel and len(jobs) > 1:
+        try:
+            parsed = parse_files_in_pool(jobs, max(PARSE_WORKERS, 1), engine)
+        except Exception:
+            # Pool unavailable (e.g. restricted environment) - parse serially instead
+            parsed = None
+
+    if parsed is None:
+        parsed = [None] * len(jobs)
+    # Parse serially whatever the pool did not (or could not) finish
+    for position, (file_bytes, filename, streaming) in enumerate(jobs):
+        if parsed[position] is None:
+            try:
+                parsed[position] = parse_workbook_job(file_bytes, engine, streaming, filename)
+            except Exception as e:
+                parsed[position] = e
+
+    for (index, cache_key, cache_id, _, filename, _), result in zip(pending, parsed):
+        if not isinstance(result, Exception):
+            save_cached_sheets(cache_id, result)
+            result = add_file_metadata(result, filename)
+            lru_cache_put(cache, cache_key, result, get_sheets_size(result))
+        results[index] = result
+
+    if pending:
+        enforce_sheet_cache_budget()
+
+    # Hand out shallow copies so added columns never leak back into the cache
+    return [
+        result if isinstance(result, Exception) else
+        [(df.copy(deep=False), dict(file_info)) for df, file_info in result]
+        for result in results
+    ]
+
+def create_team_data():
+    """Create the empty team-first structure for every registered team"""
+    return {team: {section: [] for section in SECTIONS} for team in TEAM_REGISTRY['teams']}
+
+def get_upload_keys(uploaded_files):
+    """Identify each upload across reruns by its uploader id (or name and size)"""
+    keys = []
+    seen = {}
+    for uploaded_file in uploaded_files:
+        identity = (getattr(uploaded_file, 'file_id', None), uploaded_file.name,
+                    getattr(uploaded_file, 'size', None))
+        # The same file may be uploaded twice; keep both copies distinct
+        seen[identity] = seen.get(identity, -1) + 1
+        keys.append(identity + (seen[identity],))
+    return keys
+
+def resolve_team_name(value):
+    """Map an in-file team value to a registered team by name, then by whole-word keyword"""
+    if pd.isna(value):
+        return None
+    text = str(value).strip().lower()
+    for team in TEAM_REGISTRY['teams']:
+        if team.lower() == text:
+            return team
+    # Cell values are short names, so substring matching as for filenames would
+    # file "Three Rivers" under the 'hr' keyword
+    return match_keyword(TEAM_REGISTRY['team_word_pattern'], TEAM_REGISTRY['team_lookup'], text)
+
+def split_by_team_column(df):
+    """Split a sheet by its in-file team column into (column, frames by team, unmatched values)"""
+    team_column = find_team_column(df.columns)
+    if team_column is None:
+        return None, {}, []
+
+    # Resolve each distinct value once, then map all rows through the codes
+    codes, values = pd.factorize(df[team_column], use_na_sentinel=False)
+    resolved = np.array([resolve_team_name(value) for value in values] + [None], dtype=object)
+    row_teams = resolved[codes]
+
+    unmatched = [value for value, team in zip(values, resolved) if team is None]
+    df = df.assign(_detected_team=pd.Categorical(row_teams))
+    frames = {
+        team: group.reset_index(drop=True)
+        for team, group in df.groupby('_detected_team', sort=False, observed=True)
+    }
+    return team_column, frames, unmatched
+
+def route_parsed_file(team_data, uploaded_file, parsed):
+    """File one parsed upload's sheets into team_data, returning what was placed and any errors"""
+    record = {'entries': [], 'processed': [], 'errors': []}
+    try:
+        if isinstance(parsed, Exception):
+            raise parsed
+
+        # Each sheet of a workbook is routed to its own section
+        for df, file_info in parsed:
+            # Empty sheets in multi-sheet workbooks carry no survey data
+            if len(parsed) > 1 and df.empty:
+                continue
 
-            # Categorize based on filename
-            file_info = categorize_file(uploaded_file.name)
             section = file_info['section']
-            team = file_info['team']
             filename = file_info['filename']
+            sheet = file_info['sheet'] if len(parsed) > 1 else None
+            sentiment = file_info.get('sentiment')
+
+            # Multi-team exports carry a team column; it takes precedence over the filename
+            team_frames = [(file_info['team'], df)]
+            if section in SECTIONS:
+                team_column, frames_by_team, unmatched = split_by_team_column(df)
+                if frames_by_team:
+                    team_frames = list(frames_by_team.items())
+                    # Counts were taken over the whole sheet, not per team
+                    sentiment = None
+                for value in unmatched if frames_by_team else []:
+                    value = '(blank)' if pd.isna(value) else value
+                    record['errors'].append(f"Unrecognized team '{value}' in column '{team_column}' of file: {filename}")
+
+            for team, team_df in team_frames:
+                # Store in team-first structure
+                if team and team in team_data and section in SECTIONS:
+                    file_entry = {
+                        'data': team_df,
+                        'filename': filename,
+                        'schema': get_column_schema(team_df)
+                    }
+                    if sheet is not None:
+                        file_entry['sheet'] = sheet
+                    if section == 'Comments':
+                        # Comments are tokenized once; later counts are reductions over this index
+                        comments_df, _, _, _ = analyze_comments_data(team_df)
+                        file_entry['comment_index'] = build_comment_index(comments_df['Comment'])
+                    # Sentiment counts are kept per file so team totals are a cheap merge
+                    if sentiment is not None:
+                        file_entry['sentiment'] = sentiment
+                    elif section == 'Comments':
+                        file_entry['sentiment'] = summarize_sentiment_scores(
+                            score_comment_index(file_entry['comment_index'])
+                        )
+                    team_data[team][section].append(file_entry)
+                    record['entries'].append((team, section, file_entry))
+                    record['processed'].append({
+                        'filename': filename,
+                        'sheet': sheet,
+                        'team': team,
+                        'section': section
+                    })
+                elif sheet is not None and section == 'General':
+                    record['errors'].append(f"Could not detect section for sheet '{sheet}' in file: {filename}")
+                else:
+                    # If team not recognized, try to infer or put in a default location
+                    if not team:
+                        record['errors'].append(f"Could not detect team from filename: {filename}")
+                    else:
+                        record['errors'].append(f"Unrecognized team '{team}' in file: {filename}")
 
-            # Add metadata to dataframe
-            df['_source_file'] = filename
-            df['_detected_team'] = team
-            df['_file_section'] = section
+    except Exception as e:
+        record['errors'].append(f"Error processing {uploaded_file.name}: {str(e)}")
 
-            # Store in team-first structure
-            if team and team in team_data and section in ['Themes', 'Questions', 'Comments']:
-                team_data[team][section].append({
-                    'data': df,
-                    'filename': filename
-                })
-                files_processed.append({
-                    'filename': filename,
-                    'team': team,
-                    'section': section
-                })
-            else:
-                # If team not recognized, try to infer or put in a default location
-                if not team:
-                    processing_errors.append(f"Could not detect team from filename: {filename}")
-                else:
-                    processing_errors.append(f"Unrecognized team '{team}' in file: {filename}")
+    return record
 
-        except Exception as e:
-            processing_errors.append(f"Error processing {uploaded_file.name}: {str(e)}")
+def load_and_process_multiple_files(uploaded_files, parallel=None, excel_engine=None, state=None):
+    """Load and process multiple survey data files"""
+    # parallel forces (True) or disables (False) pool parsing; excel_engine overrides SURVEY_EXCEL_ENGINE.
+    # A persistent state dict (e.g. from session state) makes processing incremental: only added
+    # files are parsed and removed ones are dropped from team_data.
+    if state is None:
+        state = {}
+
+    # Start over when the reader engine or the team registry changes
+    if ('team_data' not in state or state.get('engine') != excel_engine or
+            state.get('teams') != TEAM_REGISTRY['teams']):
+        state.clear()
+        state.update({
+            'engine': excel_engine,
+            'teams': TEAM_REGISTRY['teams'],
+            'team_data': create_team_data(),
+            'files': {},
+            'revision': 0,
+            'team_revisions': {},
+            'reports': {}
+        })
+
+    team_data = state['team_data']
+    upload_keys = get_upload_keys(uploaded_files)
+    current_keys = set(upload_keys)
+
+    # Drop the entries of files removed from the uploader
+    for key in [key for key in state['files'] if key not in current_keys]:
+        for team, section, file_entry in state['files'].pop(key)['entries']:
+            team_data[team][section] = [entry for entry in team_data[team][section] if entry is not file_entry]
+            mark_team_changed(state, team)
+
+    # Duplicates of a removed upload are processed again in its place
+    for key in [key for key, record in state['files'].items()
+                if record.get('duplicate_of') and record['duplicate_of'] not in state['files']]:
+        del state['files'][key]
+
+    # Each distinct payload is processed once; later copies are reported instead
+    originals = {
+        record['content_hash']: key for key, record in state['files'].items()
+        if record.get('content_hash') and not record.get('duplicate_of')
+    }
+    added = []
+    for key, uploaded_file in zip(upload_keys, uploaded_files):
+        if key in state['files']:
+            continue
+        try:
+            content_hash = get_content_hash(uploaded_file.getvalue())
+        except Exception:
+            # Unreadable uploads are reported by the parser
+            content_hash = None
+
+        original_key = originals.get(content_hash)
+        if original_key is not None:
+            original_name = state['files'][original_key]['filename']
+            state['files'][key] = {
+                'entries': [], 'processed': [],
+                'errors': [f"Duplicate upload skipped: {uploaded_file.name} has the same contents as {original_name}"],
+                'filename': uploaded_file.name, 'content_hash': content_hash, 'duplicate_of': original_key
+            }
+            continue
+
+        if content_hash:
+            originals[content_hash] = key
+        # Placeholder so later duplicates in this batch can name their original
+        state['files'][key] = {'filename': uploaded_file.name}
+        added.append((key, uploaded_file, content_hash))
+
+    # Load, clean and categorize only the newly added files (cached by file contents)
+    if added:
+        parsed_files = parse_uploaded_files([uploaded_file for _, uploaded_file, _ in added],
+                                            parallel=parallel, engine=excel_engine,
+                                            content_hashes=[content_hash for _, _, content_hash in added])
+        for (key, uploaded_file, content_hash), parsed in zip(added, parsed_files):
+            record = route_parsed_file(team_data, uploaded_file, parsed)
+            record['filename'] = uploaded_file.name
+            record['content_hash'] = content_hash
+            state['files'][key] = record
+            for team, _, _ in record['entries']:
+                mark_team_changed(state, team)
+
+    # Summaries follow the current upload order
+    records = [state['files'][key] for key in upload_keys]
+    files_processed = [processed for record in records for processed in record['processed']]
+    processing_errors = [error for record in records for error in record['errors']]
 
     return team_data, files_processed, processing_errors
 
+def mark_team_changed(state, team):
+    """Record that a team's data changed so reports covering it are rebuilt"""
+    state['revision'] += 1
+    state['team_revisions'][team] = state['team_revisions'].get(team, 0) + 1
+
+def get_narrative_report(team_data, team_name=None, state=None):
+    """Generate a team report, or the company-wide report when no team is given"""
+    # With ingestion state the report is reused until the data it covers changes
+    if state is not None:
+        revision = state['team_revisions'].get(team_name, 0) if team_name else state['revision']
+        cached = state['reports'].get(team_name)
+        if cached is not None and cached[0] == revision:
+            return cached[1]
+
+    if team_name:
+        report = generate_team_narrative_report(team_name, team_data[team_name])
+    else:
+        report = generate_company_wide_narrative_report(team_data)
+
+    if state is not None:
+        state['reports'][team_name] = (revision, report)
+    return report
+
+@st.cache_resource(show_spinner=False)
+def get_view_cache():
+    """Get the shared cache of consolidated section views, keyed by file identity"""
+    return create_lru_cache(VIEW_CACHE_MAX_ENTRIES, VIEW_CACHE_MAX_BYTES)
+
+def build_section_store(entries, team_names):
+    """Concatenate (team, file_info) entries once into a team-sorted section store"""
+    frames = []
+    ordered_files = []
+    slices = {}
+    lengths = []
+    start = 0
+    for team_name in team_names:
+        team_files = [file_info for entry_team, file_info in entries if entry_team == team_name]
+        rows = sum(len(file_info['data']) for file_info in team_files)
+        slices[team_name] = slice(start, start + rows)
+        lengths.append(rows)
+        start += rows
+        frames.extend(file_info['data'] for file_info in team_files)
+        ordered_files.extend(team_files)
+
+    data = concat_frames(frames) if frames else pd.DataFrame()
+    if frames:
+        # Rows are grouped by team in registry order, so each team is one contiguous slice
+        data['_team_source'] = pd.Categorical.from_codes(
+            np.repeat(np.arange(len(team_names)), lengths), categories=team_names
+        )
+        if '_source_file' in data.columns:
+            data['_source_file'] = data['_source_file'].astype('category')
+
+    # Sentiment counts taken at ingest merge into the section total without re-scoring
+    partials = [file_info.get('sentiment') for _, file_info in entries]
+    sentiment = None
+    if partials and all(partial is not None for partial in partials):
+        sentiment = merge_sentiment_partials(partials)
+
+    comment_index = get_entries_comment_index(ordered_files, data)
+    return {
+        'data': data,
+        'slices': slices,
+        'file_count': len(frames),
+        'sentiment': sentiment,
+        'comment_index': comment_index,
+        'inverted_index': build_inverted_index(comment_index) if comment_index is not None else None
+    }
+
+def get_section_store(team_data, section):
+    """Get one section's data from every team as a single consolidated, read-only store"""
+    # Holds the combined 'data', each team's row 'slices', the 'file_count' and the merged ingest
+    # 'sentiment', 'comment_index' and 'inverted_index' (None unless every file has them)
+    entries = [
+        (team_name, file_info)
+        for team_name in team_data
+        for file_info in team_data[team_name].get(section, [])
+        if 'data' in file_info and not file_info['data'].empty
+    ]
+
+    # Keyed by the identity of the file entries, which are kept alive with the store
+    cache = get_view_cache()
+    cache_key = ('section', section, tuple(team_data)) + tuple(
+        (team_name, id(file_info)) for team_name, file_info in entries
+    )
+    cached = lru_cache_get(cache, cache_key)
+    if cached is not None:
+        return cached['store']
+
+    store = build_section_store(entries, list(team_data))
+    lru_cache_put(cache, cache_key, {'store': store, 'entries': entries}, get_frame_size(store['data']))
+    return store
+
+def get_store_team_slice(store, team_name):
+    """Get a team's rows of a section store without copying"""
+    team_slice = store['slices'].get(team_name)
+    if team_slice is None:
+        return store['data'].iloc[0:0]
+    return store['data'].iloc[team_slice]
+
 def get_team_section_data(team_data, team_name, section):
-    """Get data for a specific team and section"""
+    """Get data for a specific team and section (memoized on the team's files, so read-only)"""
     if team_name not in team_data or section not in team_data[team_name]:
         return pd.DataFrame()
 
-    combined_df = pd.DataFrame()
-    team_section_files = team_data[team_name][section]
+    team_section_files = list(team_data[team_name][section])
+    if not team_section_files:
+        return pd.DataFrame()
 
-    for file_info in team_section_files:
-        if not combined_df.empty:
-            combined_df = pd.concat([combined_df, file_info['data']], ignore_index=True)
-        else:
-            combined_df = file_info['data'].copy()
+    # The file entries are kept alive with the cached frame so their ids stay unique
+    cache = get_view_cache()
+    cache_key = ('team', team_name, section) + tuple(id(file_info) for file_info in team_section_files)
+    cached = lru_cache_get(cache, cache_key)
+    if cached is not None:
+        return cached['data']
 
+    combined_df = concat_frames([file_info['data'] for file_info in team_section_files])
+    lru_cache_put(cache, cache_key, {'data': combined_df, 'entries': team_section_files},
+                  get_frame_size(combined_df))
     return combined_df
 
+def get_team_comment_index(team_data, team_name, combined_df):
+    """Get a team's (comment index, inverted index), memoized like its frame; (None, None) if not indexable"""
+    team_files = list(team_data[team_name]['Comments'])
+    cache = get_view_cache()
+    cache_key = ('team-index', team_name) + tuple(id(file_info) for file_info in team_files)
+    cached = lru_cache_get(cache, cache_key)
+    if cached is not None:
+        return cached['index'], cached['inverted']
+
+    comment_index = get_entries_comment_index(team_files, combined_df)
+    inverted = build_inverted_index(comment_index) if comment_index is not None else None
+    size = sum(array.nbytes for array in comment_index.values()) if comment_index is not None else 0
+    lru_cache_put(cache, cache_key, {'index': comment_index, 'inverted': inverted, 'entries': team_files},
+                  size * 2)
+    return comment_index, inverted
+
+def show_comment_search(comments_df, inverted, key, team_filter=False):
+    """Show a keyword search over indexed comments, filterable by theme (and team)"""
+    st.markdown("### 🔍 Search Comments")
+    query = st.text_input(
+        "Search comments",
+        key=f"comment_search_{key}",
+        placeholder="e.g. workload AND (deadline OR theme:growth) NOT meeting",
+        help="Words must all appear unless combined with OR; use NOT to exclude, parentheses to group, "
+             "a trailing * for prefixes and theme:<name> for a comment theme"
+    )
+
+    col1, col2 = st.columns(2)
+    with col1:
+        selected_themes = st.multiselect("Filter by theme", sorted(comments_df['Theme'].dropna().unique()),
+                                         key=f"comment_search_themes_{key}")
+    selected_teams = []
+    if team_filter:
+        with col2:
+            selected_teams = st.multiselect("Filter by team", list(comments_df['Team'].dropna().unique()),
+                                            key=f"comment_search_teams_{key}")
+
+    if not query.strip() and not selected_themes and not selected_teams:
+        return
+
+    try:
+        mask = search_comment_index(inverted, query)
+    except ValueError as e:
+        st.warning(f"Could not search comments: {str(e)}")
+        return
+    if selected_themes:
+        mask &= comments_df['Theme'].isin(selected_themes).to_numpy()
+    if selected_teams:
+        mask &= comments_df['Team'].isin(selected_teams).to_numpy()
+
+    matches = comments_df[mask]
+    shown = f" (showing the first {COMMENT_SEARCH_MAX_ROWS})" if len(matches) > COMMENT_SEARCH_MAX_ROWS else ""
+    st.markdown(f"**{len(matches)} matching comments**{shown}")
+    if not matches.empty:
+        columns = ['Affirmation', 'Theme', 'Comment'] + (['Team'] if team_filter else [])
+        st.dataframe(matches[columns].head(COMMENT_SEARCH_MAX_ROWS), width='stretch', hide_index=True)
+
 def show_team_themes_analysis(team_data, team_name):
     """Show themes analysis for a specific team"""
     st.markdown(f"""
@@ -820,8 +2025,8 @@ def show_team_themes_analysis(team_data, team_name):
         try:
             if 'Score' in filtered_df.columns:
                 theme_df = filtered_df[['Theme', 'Score']].copy()
-                theme_df['Score_Display'] = theme_df['Score'].astype(str)
-                numeric_scores = pd.to_numeric(theme_df['Score'], errors='coerce')
+                # Scores are stored in float32, so round them for display
+                numeric_scores = get_numeric_scores(filtered_df, 'Score').astype('float64').round(2)
                 theme_df['Score_Display'] = numeric_scores.combine_first(theme_df['Score'].astype(str))
                 theme_df = theme_df.dropna(subset=['Theme'])
                 display_df = theme_df[['Theme', 'Score_Display']].rename(columns={'Score_Display': 'Score'})
@@ -841,12 +2046,12 @@ def show_team_themes_analysis(team_data, team_name):
             # Create visualization if scores are available
             if 'Score' in filtered_df.columns:
                 try:
-                    filtered_df_copy = filtered_df.copy()
-                    filtered_df_copy['Score_Numeric'] = pd.to_numeric(filtered_df_copy['Score'], errors='coerce')
-                    valid_scores = filtered_df_copy.dropna(subset=['Score_Numeric', 'Theme'])
+                    valid_scores = filtered_df[['Theme']].assign(
+                        Score_Numeric=get_numeric_scores(filtered_df, 'Score')
+                    ).dropna(subset=['Score_Numeric', 'Theme'])
 
                     if not valid_scores.empty:
-                        theme_scores = valid_scores.groupby('Theme')['Score_Numeric'].mean().sort_values(ascending=False).head(10)
+                        theme_scores = valid_scores.groupby('Theme', observed=True)['Score_Numeric'].mean().sort_values(ascending=False).head(10)
 
                         if not theme_scores.empty:
                             fig = px.bar(
@@ -866,113 +2071,101 @@ def show_team_themes_analysis(team_data, team_name):
     else:
         st.info("No 'Theme' column found in the data.")
 
-def analyze_questions_data(filtered_df):
-    """Analyze questions data to extract affirmations, themes, and scores"""
-    questions_data = []
-
-    # Look for question/affirmation column
-    question_col = None
-    for col in filtered_df.columns:
-        if any(word in col.lower() for word in ['question', 'affirmation', 'statement', 'item']):
-            question_col = col
-            break
-
-    # Look for theme column
-    theme_col = None
-    for col in filtered_df.columns:
-        if any(word in col.lower() for word in ['theme', 'category', 'domain']):
-            theme_col = col
-            break
-
-    # Look for score column
-    score_col = None
-    for col in filtered_df.columns:
-        if any(word in col.lower() for word in ['score', 'rating', 'value']) and not col.startswith('_'):
-            score_col = col
-            break
-
-    if question_col and not filtered_df[question_col].isna().all():
-        # Process row-by-row data (each row is a question/affirmation)
-        for idx, row in filtered_df.iterrows():
-            question_text = row.get(question_col)
-            if pd.isna(question_text) or str(question_text).strip() == '':
-                continue
+def label_values(values):
+    """Cell values as display labels, reading "Not specified" where missing"""
+    return values.astype(object).where(values.notna(), 'Not specified').astype(str)
 
-            # Get theme
-            theme = str(row.get(theme_col, "Not specified")) if theme_col else "Not specified"
+def analyze_questions_data(filtered_df):
+    """Analyze questions data into a typed frame of affirmations, themes and scores"""
+    # Question/affirmation, theme and score columns
+    roles = get_column_schema(filtered_df)['roles']
+    question_col, theme_col, score_col = roles['question'], roles['theme'], roles['score']
+
+    if not question_col or filtered_df[question_col].isna().all():
+        questions_df = pd.DataFrame({
+            'Affirmation': pd.Series(dtype=object),
+            'Theme': pd.Categorical([]),
+            'Score': pd.Series(dtype='float64')
+        })
+        return questions_df, question_col, theme_col, score_col
 
-            # Get score
-            score_value = None
-            if score_col and pd.notna(row.get(score_col)):
-                score_raw = row.get(score_col)
-                try:
-                    score_numeric = pd.to_numeric(score_raw, errors='coerce')
-                    if pd.notna(score_numeric):
-                        score_value = f"{score_numeric:.2f}"
-                    else:
-                        score_value = str(score_raw)
-                except:
-                    score_value = str(score_raw)
+    # Each row is a question/affirmation; blank ones are skipped
+    questions = filtered_df[question_col]
+    affirmations = questions.astype(str).str.strip()
+    keep = questions.notna() & (affirmations != '')
 
-            question_info = {
-                "Affirmation": str(question_text).strip(),
-                "Theme": theme,
-                "Score": score_value if score_value else "No score"
-            }
-            questions_data.append(question_info)
+    if theme_col:
+        themes = label_values(filtered_df.loc[keep, theme_col])
+    else:
+        themes = pd.Series('Not specified', index=affirmations[keep].index)
 
-    return questions_data, question_col, theme_col, score_col
+    # Scores stay float (NaN without a numeric score) and are only formatted when displayed
+    if score_col:
+        scores = get_numeric_scores(filtered_df, score_col)[keep].astype('float64')
+    else:
+        scores = pd.Series(np.nan, index=affirmations[keep].index)
+
+    questions_df = pd.DataFrame({
+        'Affirmation': affirmations[keep],
+        'Theme': themes.astype('category'),
+        'Score': scores
+    }).reset_index(drop=True)
+    return questions_df, question_col, theme_col, score_col
+
+def format_question_score(score):
+    """Display text of a question score"""
+    return "No score" if pd.isna(score) else f"{score:.2f}"
+
+def summarize_question_themes(questions_df):
+    """Question count and average score per theme, lowest average first (unscored themes last)"""
+    summary = questions_df.groupby('Theme', observed=True, sort=False)['Score'].agg(['size', 'mean'])
+    # Categorical groups come out in category order; restore first appearance
+    summary = summary.reindex(questions_df['Theme'].drop_duplicates())
+    themes = [(theme, int(row['size']), 0 if pd.isna(row['mean']) else row['mean'])
+              for theme, row in summary.iterrows()]
+    return sorted(themes, key=lambda x: x[2] if x[2] > 0 else 999)
 
 def analyze_comments_data(filtered_df):
-    """Analyze comments data to extract affirmations, themes, and comments"""
-    comments_data = []
-
-    # Look for affirmation/question column
-    question_col = None
-    for col in filtered_df.columns:
-        if any(word in col.lower() for word in ['question', 'affirmation', 'statement', 'item']):
-            question_col = col
-            break
-
-    # Look for theme column
-    theme_col = None
-    for col in filtered_df.columns:
-        if any(word in col.lower() for word in ['theme', 'category', 'domain']):
-            theme_col = col
-            break
-
-    # Look for comment column
-    comment_col = None
-    for col in filtered_df.columns:
-        if any(word in col.lower() for word in ['comment', 'feedback', 'response', 'text', 'opinion']) and not col.startswith('_'):
-            comment_col = col
-            break
-
-    if comment_col and not filtered_df[comment_col].isna().all():
-        # Process row-by-row data (each row has affirmation, theme, and comment)
-        for idx, row in filtered_df.iterrows():
-            comment_text = row.get(comment_col)
-            if pd.isna(comment_text) or str(comment_text).strip() == '':
-                continue
-
-            # Get affirmation/question
-            affirmation = str(row.get(question_col, "Not specified")) if question_col else "Not specified"
+    """Analyze comments data into a columnar frame of affirmations, themes, comments and teams"""
+    # Affirmation/question, theme and comment columns
+    roles = get_column_schema(filtered_df)['roles']
+    question_col, theme_col, comment_col = roles['question'], roles['theme'], roles['comment']
+
+    if not comment_col or filtered_df[comment_col].isna().all():
+        comments_df = pd.DataFrame({
+            'Affirmation': pd.Series(dtype=object),
+            'Theme': pd.Categorical([]),
+            'Comment': pd.Series(dtype=object),
+            'Team': pd.Categorical([])
+        })
+        return comments_df, question_col, theme_col, comment_col
 
-            # Get theme
-            theme = str(row.get(theme_col, "Not specified")) if theme_col else "Not specified"
+    # Each row has an affirmation, theme and comment; blank comments are skipped
+    comments = filtered_df[comment_col]
+    comment_text = comments.astype(str).str.strip()
+    keep = comments.notna() & (comment_text != '')
+    index = comment_text[keep].index
 
-            comment_info = {
-                "Affirmation": affirmation.strip(),
-                "Theme": theme,
-                "Comment": str(comment_text).strip()
-            }
+    if question_col:
+        affirmations = label_values(filtered_df.loc[keep, question_col]).str.strip()
+    else:
+        affirmations = pd.Series('Not specified', index=index)
+    if theme_col:
+        themes = label_values(filtered_df.loc[keep, theme_col])
+    else:
+        themes = pd.Series('Not specified', index=index)
 
-            # Add team source if available
-            if '_team_source' in row:
-                comment_info['_team_source'] = row['_team_source']
-            comments_data.append(comment_info)
+    # Consolidated views carry the team of every row; single files their detected team
+    team_col = next((col for col in ['_team_source', '_detected_team'] if col in filtered_df.columns), None)
+    teams = filtered_df.loc[keep, team_col] if team_col else pd.Series(np.nan, index=index)
 
-    return comments_data, question_col, theme_col, comment_col
+    comments_df = pd.DataFrame({
+        'Affirmation': affirmations,
+        'Theme': themes.astype('category'),
+        'Comment': comment_text[keep],
+        'Team': teams.astype('category')
+    }).reset_index(drop=True)
+    return comments_df, question_col, theme_col, comment_col
 
 def show_team_questions_analysis(team_data, team_name):
     """Show questions analysis for a specific team"""
@@ -998,16 +2191,17 @@ def show_team_questions_analysis(team_data, team_name):
     st.markdown("### 📊 Questions Overview")
 
     # Use new questions analysis function
-    questions_data, question_col, theme_col, score_col = analyze_questions_data(filtered_df)
+    questions_df, question_col, theme_col, score_col = analyze_questions_data(filtered_df)
 
     # Show data structure detection
     st.markdown(f"**📋 Data Structure Detected:**")
-    st.markdown(f"- **Questions Column:** {question_col or '❌ Not found'}")
-    st.markdown(f"- **Theme Column:** {theme_col or '❌ Not found'}")
-    st.markdown(f"- **Score Column:** {score_col or '❌ Not found'}")
+    schema = get_column_schema(filtered_df)
+    st.markdown(f"- **Questions Column:** {describe_schema_column(schema, 'question')}")
+    st.markdown(f"- **Theme Column:** {describe_schema_column(schema, 'theme')}")
+    st.markdown(f"- **Score Column:** {describe_schema_column(schema, 'score')}")
     st.markdown("---")
 
-    if not questions_data:
+    if questions_df.empty:
         st.info("Expected Excel format: Each row should contain a question/affirmation with columns for Question, Theme, and Score")
         st.markdown("**Available columns in your data:**")
         for col in filtered_df.columns:
@@ -1015,18 +2209,21 @@ def show_team_questions_analysis(team_data, team_name):
                 st.markdown(f"- {col}")
         return
 
-    st.markdown(f"**📊 Found {len(questions_data)} questions/affirmations**")
+    st.markdown(f"**📊 Found {len(questions_df)} questions/affirmations**")
 
-    if questions_data:
-        # Display enhanced questions table
-        questions_df = pd.DataFrame(questions_data)
-        st.dataframe(questions_df, width='stretch')
+    if not questions_df.empty:
+        # Display enhanced questions table; scores stay numeric so the column sorts
+        st.dataframe(
+            questions_df,
+            width='stretch',
+            column_config={"Score": st.column_config.NumberColumn("Score", format="%.2f")}
+        )
 
         # Show detailed question cards for better readability
         st.markdown("### 📋 Detailed Questions Analysis")
 
         # Add theme filter
-        themes = list(set([q['Theme'] for q in questions_data if q['Theme'] != 'Not specified']))
+        themes = [theme for theme in questions_df['Theme'].unique() if theme != 'Not specified']
         if themes:
             st.markdown("### 🔍 Filter by Theme")
             selected_theme = st.selectbox(
@@ -1036,41 +2233,33 @@ def show_team_questions_analysis(team_data, team_name):
             )
 
             if selected_theme != 'All themes':
-                questions_data = [q for q in questions_data if q['Theme'] == selected_theme]
-                st.markdown(f"**Filtered to {len(questions_data)} questions for theme: {selected_theme}**")
+                questions_df = questions_df[questions_df['Theme'] == selected_theme]
+                st.markdown(f"**Filtered to {len(questions_df)} questions for theme: {selected_theme}**")
 
         # Sort alphabetically by affirmation
-        questions_data_sorted = sorted(questions_data, key=lambda x: x['Affirmation'])
+        questions_sorted = questions_df.sort_values('Affirmation', kind='stable')
 
         # Display questions in card format grouped by theme
         current_theme = None
-        for question in questions_data_sorted:
+        for affirmation, theme, score in questions_sorted.itertuples(index=False):
             # Group by theme
-            if question['Theme'] != current_theme:
-                current_theme = question['Theme']
+            if theme != current_theme:
+                current_theme = theme
                 st.markdown(f"#### 🎯 {current_theme}")
 
-            # Determine card style based on score (try to parse score for styling)
+            # Card style follows the score
             card_style = "info"
-            score_display = ""
-
-            # Try to determine numeric value for styling
-            try:
-                if question['Score'] != "No score":
-                    score_numeric = pd.to_numeric(question['Score'], errors='coerce')
-                    if pd.notna(score_numeric):
-                        if score_numeric >= 4.0:
-                            card_style = "success"
-                        elif score_numeric <= 2.5:
-                            card_style = "warning"
-                score_display = f"<div style='font-size: 1.2rem; font-weight: 700; color: #667eea; margin: 0.5rem 0;'>📊 Score: {question['Score']}</div>"
-            except:
-                score_display = f"<div style='font-size: 1rem; color: #64748b; margin: 0.5rem 0;'>📊 {question['Score']}</div>"
+            if pd.notna(score):
+                if score >= 4.0:
+                    card_style = "success"
+                elif score <= 2.5:
+                    card_style = "warning"
+            score_display = f"<div style='font-size: 1.2rem; font-weight: 700; color: #667eea; margin: 0.5rem 0;'>📊 Score: {format_question_score(score)}</div>"
 
             st.markdown(f"""
             <div class="tab-info-card {card_style}">
                 <div style="font-weight: 700; font-size: 1.1rem; margin-bottom: 0.5rem; color: #2c3e50;">
-                    💬 {question['Affirmation']}
+                    💬 {affirmation}
                 </div>
                 {score_display}
             </div>
@@ -1162,52 +2351,36 @@ def generate_narrative_analysis(sentiment_data, team_name):
 
     return narrative_points
 
-def generate_comprehensive_insights(sentiment_data, all_comments):
+def count_theme_sentiment(comment_index):
+    """Theme x (mentions, positive, negative) matrix of an indexed set of comments"""
+    themes = list(INSIGHT_THEME_KEYWORDS)
+    positive, negative, hits = match_comment_index(comment_index, INSIGHT_LEXICON, themes)
+    context = np.column_stack([np.ones(len(positive)), positive > 0, negative > 0]).astype('int64')
+    matrix = hits.T.astype('int64') @ context
+    return pd.DataFrame(matrix, index=themes, columns=['mentions', 'positive', 'negative'])
+
+def generate_comprehensive_insights(sentiment_data, all_comments, comment_index=None):
     """Generate comprehensive thematic insights based on actual comment analysis"""
     insights = []
+    # The document-term index built at ingest is reused when given
+    if comment_index is None:
+        comment_index = build_comment_index(all_comments)
 
     # Analyze common patterns in comments (without revealing actual text)
-    comment_text = " ".join(all_comments).lower()
     total_comments = len(all_comments)
-    avg_length = sum(len(comment) for comment in all_comments) / total_comments if total_comments > 0 else 0
-
-    # Define keyword categories with more comprehensive terms
-    theme_keywords = {
-        'workload_time': ['time', 'hours', 'workload', 'overload', 'busy', 'deadline', 'pressure', 'stress', 'overwhelmed', 'capacity', 'bandwidth'],
-        'clarity_vision': ['uncertainty', 'unclear', 'vision', 'direction', 'confused', 'clarity', 'priorities', 'goals', 'strategy', 'roadmap', 'purpose'],
-        'culture_engagement': ['culture', 'events', 'engagement', 'fun', 'team', 'connection', 'balance', 'office', 'workplace', 'morale', 'atmosphere'],
-        'communication': ['communication', 'feedback', 'transparent', 'updates', 'information', 'know', 'understand', 'listening', 'sharing'],
-        'growth_development': ['growth', 'development', 'learning', 'career', 'skills', 'opportunities', 'advancement', 'training', 'mentorship'],
-        'leadership_management': ['leadership', 'management', 'support', 'guidance', 'decision', 'leader', 'manager', 'supervisor'],
-        'resources_tools': ['resources', 'tools', 'budget', 'equipment', 'technology', 'support', 'infrastructure'],
-        'process_efficiency': ['process', 'efficiency', 'workflow', 'procedures', 'systems', 'organization', 'structure']
-    }
-
-    # Count keyword frequency and sentiment context
-    theme_analysis = {}
-    for theme, keywords in theme_keywords.items():
-        keyword_count = sum(comment_text.count(keyword) for keyword in keywords)
-        if keyword_count > 0:
-            # Analyze sentiment context around these keywords
-            positive_context = sum(1 for comment in all_comments
-                                 if any(keyword in comment.lower() for keyword in keywords)
-                                 and any(pos_word in comment.lower() for pos_word in ['good', 'great', 'excellent', 'positive', 'love', 'appreciate', 'satisfied']))
-            negative_context = sum(1 for comment in all_comments
-                                 if any(keyword in comment.lower() for keyword in keywords)
-                                 and any(neg_word in comment.lower() for neg_word in ['bad', 'poor', 'lack', 'need', 'problem', 'issue', 'concern', 'difficult']))
-
-            theme_analysis[theme] = {
-                'count': keyword_count,
-                'positive': positive_context,
-                'negative': negative_context,
-                'total_mentions': positive_context + negative_context
-            }
+    avg_length = comment_index['lengths'].sum() / total_comments if total_comments > 0 else 0
+
+    # Theme x sentiment counts; only mentioned themes are considered
+    theme_matrix = count_theme_sentiment(comment_index)
+    theme_matrix = theme_matrix[theme_matrix['mentions'] > 0].assign(
+        total_mentions=lambda matrix: matrix['positive'] + matrix['negative']
+    )
 
     # Sort themes by relevance (total mentions)
-    sorted_themes = sorted(theme_analysis.items(), key=lambda x: x[1]['total_mentions'], reverse=True)
+    top_themes = theme_matrix.sort_values('total_mentions', ascending=False, kind='stable').head(4)
 
     # Generate insights based on actual data patterns
-    for theme, data in sorted_themes[:4]:  # Top 4 themes
+    for theme, data in top_themes.iterrows():  # Top 4 themes
         if data['total_mentions'] == 0:
             continue
 
@@ -1293,23 +2466,31 @@ def generate_team_narrative_report(team_name, team_files):
             if 'data' not in file_info or file_info['data'].empty:
                 continue
 
-            data = file_info['data']
-
-            if category == 'Themes':
-                report += generate_themes_narrative(data, team_name)
-            elif category == 'Questions':
-                report += generate_questions_narrative(data, team_name)
-            elif category == 'Comments':
-                report += generate_comments_narrative(data, team_name)
+            # Narratives are kept on the file entry, so only newly added files are analyzed
+            if file_info.get('narrative') is None:
+                file_info['narrative'] = generate_file_narrative(category, file_info, team_name)
+            report += file_info['narrative']
 
     return report
 
+def generate_file_narrative(category, file_info, team_name):
+    """Generate the narrative section for one file of a team"""
+    data = file_info['data']
+
+    if category == 'Themes':
+        return generate_themes_narrative(data, team_name)
+    elif category == 'Questions':
+        return generate_questions_narrative(data, team_name)
+    elif category == 'Comments':
+        return generate_comments_narrative(data, team_name, file_info.get('sentiment'))
+    return ""
+
 def generate_company_wide_narrative_report(team_data):
     """Generate a comprehensive narrative report for company-wide analysis"""
     report = "# Company-Wide Survey Analysis Report\n\n"
     report += f"Generated on: {pd.Timestamp.now().strftime('%B %d, %Y')}\n\n"
 
-    team_names = ["Andrew's Team", 'Build Team', 'People and Marketing Team', 'Finance and Operations Team']
+    team_names = TEAM_REGISTRY['teams']
 
     # Executive Summary with team overview
     report += "## Executive Summary\n\n"
@@ -1318,45 +2499,21 @@ def generate_company_wide_narrative_report(team_data):
     teams_with_data = []
     total_responses = 0
 
+    # One consolidated store per section; team rows are zero-copy slices of it
+    stores = {section: get_section_store(team_data, section) for section in SECTIONS}
+
     for team_name in team_names:
         if team_name in team_data and any(team_data[team_name].values()):
             teams_with_data.append(team_name)
             # Count responses for this team
-            for category, files in team_data[team_name].items():
-                for file_info in files:
-                    if 'data' in file_info and not file_info['data'].empty:
-                        total_responses += len(file_info['data'])
+            for store in stores.values():
+                total_responses += len(get_store_team_slice(store, team_name))
 
     report += f"This comprehensive analysis covers **{len(teams_with_data)} teams** with a total of **{total_responses} responses** across themes, questions, and comments.\n\n"
 
     if teams_with_data:
         report += f"**Teams Analyzed:** {', '.join(teams_with_data)}\n\n"
 
-    # Aggregate data
-    all_themes_data = []
-    all_questions_data = []
-    all_comments_data = []
-
-    for team_name in team_names:
-        if team_name in team_data:
-            for file_info in team_data[team_name].get('Themes', []):
-                if 'data' in file_info and not file_info['data'].empty:
-                    themes_data = file_info['data'].copy()
-                    themes_data['_team_source'] = team_name
-                    all_themes_data.append(themes_data)
-
-            for file_info in team_data[team_name].get('Questions', []):
-                if 'data' in file_info and not file_info['data'].empty:
-                    questions_data = file_info['data'].copy()
-                    questions_data['_team_source'] = team_name
-                    all_questions_data.append(questions_data)
-
-            for file_info in team_data[team_name].get('Comments', []):
-                if 'data' in file_info and not file_info['data'].empty:
-                    comments_data = file_info['data'].copy()
-                    comments_data['_team_source'] = team_name
-                    all_comments_data.append(comments_data)
-
     # Individual Team Summaries
     report += "## Team-by-Team Summary\n\n"
 
@@ -1364,41 +2521,25 @@ def generate_company_wide_narrative_report(team_data):
         report += f"### {team_name}\n\n"
 
         # Get team-specific data
-        team_themes = []
-        team_questions = []
-        team_comments = []
-
-        if team_name in team_data:
-            # Process themes
-            for file_info in team_data[team_name].get('Themes', []):
-                if 'data' in file_info and not file_info['data'].empty:
-                    team_themes.append(file_info['data'])
-
-            # Process questions
-            for file_info in team_data[team_name].get('Questions', []):
-                if 'data' in file_info and not file_info['data'].empty:
-                    team_questions.append(file_info['data'])
-
-            # Process comments
-            for file_info in team_data[team_name].get('Comments', []):
-                if 'data' in file_info and not file_info['data'].empty:
-                    team_comments.append(file_info['data'])
+        combined_themes = get_store_team_slice(stores['Themes'], team_name)
+        combined_questions = get_store_team_slice(stores['Questions'], team_name)
+        combined_comments = get_store_team_slice(stores['Comments'], team_name)
+        team_themes = not combined_themes.empty
+        team_questions = not combined_questions.empty
+        team_comments = not combined_comments.empty
 
         # Generate team summary
         team_summary_items = []
 
         if team_themes:
-            combined_themes = pd.concat(team_themes, ignore_index=True)
             theme_count = len(combined_themes)
             team_summary_items.append(f"**Themes:** {theme_count} responses")
 
         if team_questions:
-            combined_questions = pd.concat(team_questions, ignore_index=True)
             question_count = len(combined_questions)
             team_summary_items.append(f"**Questions:** {question_count} responses")
 
         if team_comments:
-            combined_comments = pd.concat(team_comments, ignore_index=True)
             comment_count = len(combined_comments)
             team_summary_items.append(f"**Comments:** {comment_count} responses")
 
@@ -1408,25 +2549,19 @@ def generate_company_wide_narrative_report(team_data):
         # Add team-specific insights
         if team_themes:
             # Quick theme analysis
-            theme_col = None
-            score_col = None
-            for col in combined_themes.columns:
-                if any(word in col.lower() for word in ['theme', 'category', 'domain']):
-                    theme_col = col
-                    break
-            for col in combined_themes.columns:
-                if any(word in col.lower() for word in ['score', 'rating', 'value']) and not col.startswith('_'):
-                    score_col = col
-                    break
+            roles = get_column_schema(combined_themes)['roles']
+            theme_col, score_col = roles['theme'], roles['score']
 
             if theme_col and score_col:
                 try:
-                    combined_themes['Score_Numeric'] = pd.to_numeric(combined_themes[score_col], errors='coerce')
-                    valid_data = combined_themes.dropna(subset=['Score_Numeric', theme_col])
+                    valid_data = combined_themes[[theme_col]].assign(
+                        Score_Numeric=get_numeric_scores(combined_themes, score_col)
+                    ).dropna(subset=['Score_Numeric', theme_col])
                     if not valid_data.empty:
                         avg_score = valid_data['Score_Numeric'].mean()
-                        top_theme = valid_data.groupby(theme_col)['Score_Numeric'].mean().idxmax()
-                        top_score = valid_data.groupby(theme_col)['Score_Numeric'].mean().max()
+                        theme_means = valid_data.groupby(theme_col, observed=True)['Score_Numeric'].mean()
+                        top_theme = theme_means.idxmax()
+                        top_score = theme_means.max()
                         report += f"**Key Insight:** Average team score is {avg_score:.2f}. Top performing theme: '{top_theme}' ({top_score:.2f})\n\n"
                 except:
                     pass
@@ -1434,28 +2569,31 @@ def generate_company_wide_narrative_report(team_data):
         if team_comments:
             # Quick sentiment analysis
             try:
-                comments_data, _, _, comment_col = analyze_comments_data(combined_comments)
-                if comments_data:
-                    all_team_comments = [item['Comment'] for item in comments_data if item.get('Comment') and item['Comment'] != "No comment"]
-                    if all_team_comments:
-                        sentiment_analysis = analyze_comment_sentiment(all_team_comments)
+                comments_df, _, _, comment_col = analyze_comments_data(combined_comments)
+                if not comments_df.empty:
+                    all_team_comments = comments_df['Comment']
+                    if not all_team_comments.empty:
+                        sentiment_analysis = (get_precomputed_sentiment(team_data[team_name].get('Comments', [])) or
+                                              analyze_comment_sentiment(all_team_comments))
                         positive_pct = sentiment_analysis['positive_count'] / sentiment_analysis['total_comments'] * 100
                         report += f"**Sentiment:** {positive_pct:.0f}% positive sentiment across comments\n\n"
             except:
                 pass
 
     # Company-Wide Analysis
-    if all_themes_data:
+    if stores['Themes']['file_count']:
         report += "## Company-Wide Themes Analysis\n\n"
-        report += generate_company_themes_narrative(all_themes_data, team_names)
+        report += generate_company_themes_narrative(stores['Themes']['data'], team_names)
 
-    if all_questions_data:
+    if stores['Questions']['file_count']:
         report += "## Company-Wide Questions Analysis\n\n"
-        report += generate_company_questions_narrative(all_questions_data, team_names)
+        report += generate_company_questions_narrative(stores['Questions']['data'], team_names)
 
-    if all_comments_data:
+    if stores['Comments']['file_count']:
         report += "## Company-Wide Comments Analysis\n\n"
-        report += generate_company_comments_narrative(all_comments_data, team_names)
+        report += generate_company_comments_narrative(stores['Comments']['data'], team_names,
+                                                      stores['Comments']['sentiment'],
+                                                      stores['Comments']['comment_index'])
 
     # Strategic Recommendations
     report += "## Strategic Recommendations\n\n"
@@ -1475,24 +2613,19 @@ def generate_themes_narrative(data, team_name):
     """Generate narrative text for themes data"""
     narrative = f"### {team_name} - Themes Overview\n\n"
 
-    # Look for theme and score columns
-    theme_col = score_col = None
-    for col in data.columns:
-        if any(word in col.lower() for word in ['theme', 'category', 'domain']):
-            theme_col = col
-            break
-    for col in data.columns:
-        if any(word in col.lower() for word in ['score', 'rating', 'value']) and not col.startswith('_'):
-            score_col = col
-            break
+    # Theme and score columns
+    roles = get_column_schema(data)['roles']
+    theme_col, score_col = roles['theme'], roles['score']
 
     if theme_col and score_col:
         try:
-            data['Score_Numeric'] = pd.to_numeric(data[score_col], errors='coerce')
-            valid_data = data.dropna(subset=['Score_Numeric', theme_col])
+            # Work on a local frame; the file's data is shared and must not be modified
+            valid_data = data[[theme_col]].assign(
+                Score_Numeric=get_numeric_scores(data, score_col)
+            ).dropna(subset=['Score_Numeric', theme_col])
 
             if not valid_data.empty:
-                theme_scores = valid_data.groupby(theme_col)['Score_Numeric'].agg(['mean', 'count']).round(2)
+                theme_scores = valid_data.groupby(theme_col, observed=True)['Score_Numeric'].agg(['mean', 'count']).round(2)
                 theme_scores = theme_scores.sort_values('mean', ascending=False)
 
                 narrative += f"Analysis of {len(valid_data)} theme responses reveals the following patterns:\n\n"
@@ -1519,54 +2652,35 @@ def generate_questions_narrative(data, team_name):
     """Generate narrative text for questions data"""
     narrative = f"### {team_name} - Questions Analysis\n\n"
 
-    questions_data, question_col, theme_col, score_col = analyze_questions_data(data)
-
-    if questions_data:
-        narrative += f"Analysis of {len(questions_data)} questions reveals key insights about team perceptions:\n\n"
-
-        # Group by theme
-        theme_summary = {}
-        for item in questions_data:
-            theme = item.get('Theme', 'Not specified')
-            if theme not in theme_summary:
-                theme_summary[theme] = {'count': 0, 'scores': []}
-            theme_summary[theme]['count'] += 1
-            if item.get('Score') and item['Score'] != "No score":
-                try:
-                    score_numeric = pd.to_numeric(item['Score'], errors='coerce')
-                    if pd.notna(score_numeric):
-                        theme_summary[theme]['scores'].append(score_numeric)
-                except:
-                    pass
-
-        # Sort by average score
-        themes_with_scores = []
-        for theme, data_item in theme_summary.items():
-            avg_score = sum(data_item['scores']) / len(data_item['scores']) if data_item['scores'] else 0
-            themes_with_scores.append((theme, data_item, avg_score))
+    questions_df, question_col, theme_col, score_col = analyze_questions_data(data)
 
-        sorted_themes = sorted(themes_with_scores, key=lambda x: x[2] if x[2] > 0 else 999)
+    if not questions_df.empty:
+        narrative += f"Analysis of {len(questions_df)} questions reveals key insights about team perceptions:\n\n"
 
+        # Themes ordered by average score
         narrative += "**Theme Performance (ordered by score):**\n"
-        for theme, data_item, avg_score in sorted_themes:
+        for theme, count, avg_score in summarize_question_themes(questions_df):
             score_text = f"{avg_score:.2f}" if avg_score > 0 else "No scores"
-            narrative += f"- {theme}: {score_text} ({data_item['count']} questions)\n"
+            narrative += f"- {theme}: {score_text} ({count} questions)\n"
 
         narrative += "\n"
 
     return narrative
 
-def generate_comments_narrative(data, team_name):
-    """Generate narrative text for comments data"""
+def generate_comments_narrative(data, team_name, sentiment_partial=None):
+    """Generate narrative text for comments data, reusing sentiment counts computed at ingest when given"""
     narrative = f"### {team_name} - Comments Analysis\n\n"
 
-    comments_data, question_col, theme_col, comment_col = analyze_comments_data(data)
+    comments_df, question_col, theme_col, comment_col = analyze_comments_data(data)
 
-    if comments_data:
-        all_comments = [item['Comment'] for item in comments_data if item.get('Comment') and item['Comment'] != "No comment"]
+    if not comments_df.empty:
+        all_comments = comments_df['Comment']
 
-        if all_comments:
-            sentiment_analysis = analyze_comment_sentiment(all_comments)
+        if not all_comments.empty:
+            if sentiment_partial is not None and sentiment_partial['total_comments']:
+                sentiment_analysis = finalize_sentiment(sentiment_partial)
+            else:
+                sentiment_analysis = analyze_comment_sentiment(all_comments)
             narrative_points = generate_narrative_analysis(sentiment_analysis, team_name)
 
             narrative += f"Analysis of {len(all_comments)} comments from {team_name}:\n\n"
@@ -1584,29 +2698,21 @@ def generate_comments_narrative(data, team_name):
 
     return narrative
 
-def generate_company_themes_narrative(all_themes_data, team_names):
+def generate_company_themes_narrative(combined_themes, team_names):
     """Generate company-wide themes narrative"""
     narrative = ""
 
-    combined_themes = pd.concat(all_themes_data, ignore_index=True) if all_themes_data else pd.DataFrame()
-
     if not combined_themes.empty:
-        theme_col = score_col = None
-        for col in combined_themes.columns:
-            if any(word in col.lower() for word in ['theme', 'category', 'domain']):
-                theme_col = col
-                break
-        for col in combined_themes.columns:
-            if any(word in col.lower() for word in ['score', 'rating', 'value']) and not col.startswith('_'):
-                score_col = col
-                break
+        roles = get_column_schema(combined_themes)['roles']
+        theme_col, score_col = roles['theme'], roles['score']
 
         if theme_col and score_col:
-            combined_themes['Score_Numeric'] = pd.to_numeric(combined_themes[score_col], errors='coerce')
-            valid_data = combined_themes.dropna(subset=['Score_Numeric', theme_col])
+            valid_data = combined_themes[[theme_col]].assign(
+                Score_Numeric=get_numeric_scores(combined_themes, score_col)
+            ).dropna(subset=['Score_Numeric', theme_col])
 
             if not valid_data.empty:
-                theme_scores = valid_data.groupby(theme_col)['Score_Numeric'].agg(['mean', 'count']).round(2)
+                theme_scores = valid_data.groupby(theme_col, observed=True)['Score_Numeric'].agg(['mean', 'count']).round(2)
                 theme_scores = theme_scores.sort_values('mean', ascending=False)
 
                 narrative += f"Company-wide theme analysis across {len(valid_data)} responses from all teams:\n\n"
@@ -1623,65 +2729,43 @@ def generate_company_themes_narrative(all_themes_data, team_names):
 
     return narrative
 
-def generate_company_questions_narrative(all_questions_data, team_names):
+def generate_company_questions_narrative(combined_questions, team_names):
     """Generate company-wide questions narrative"""
     narrative = ""
 
-    combined_questions = pd.concat(all_questions_data, ignore_index=True) if all_questions_data else pd.DataFrame()
-
     if not combined_questions.empty:
-        questions_data, question_col, theme_col, score_col = analyze_questions_data(combined_questions)
-
-        if questions_data:
-            # Group by theme and analyze
-            theme_summary = {}
-            for item in questions_data:
-                theme = item.get('Theme', 'Not specified')
-                if theme not in theme_summary:
-                    theme_summary[theme] = {'count': 0, 'scores': []}
-                theme_summary[theme]['count'] += 1
-                if item.get('Score') and item['Score'] != "No score":
-                    try:
-                        score_numeric = pd.to_numeric(item['Score'], errors='coerce')
-                        if pd.notna(score_numeric):
-                            theme_summary[theme]['scores'].append(score_numeric)
-                    except:
-                        pass
-
-            narrative += f"Company-wide questions analysis covering {len(questions_data)} questions across all teams:\n\n"
-
-            # Sort by score
-            themes_with_scores = []
-            for theme, data in theme_summary.items():
-                avg_score = sum(data['scores']) / len(data['scores']) if data['scores'] else 0
-                themes_with_scores.append((theme, data, avg_score))
+        questions_df, question_col, theme_col, score_col = analyze_questions_data(combined_questions)
 
-            sorted_themes = sorted(themes_with_scores, key=lambda x: x[2] if x[2] > 0 else 999)
+        if not questions_df.empty:
+            narrative += f"Company-wide questions analysis covering {len(questions_df)} questions across all teams:\n\n"
 
+            # Themes ordered by average score
             narrative += "**Theme Performance Summary:**\n"
-            for theme, data, avg_score in sorted_themes:
+            for theme, count, avg_score in summarize_question_themes(questions_df):
                 score_text = f"{avg_score:.2f}" if avg_score > 0 else "No scores available"
-                narrative += f"- {theme}: {score_text} ({data['count']} questions)\n"
+                narrative += f"- {theme}: {score_text} ({count} questions)\n"
 
             narrative += "\n"
 
     return narrative
 
-def generate_company_comments_narrative(all_comments_data, team_names):
-    """Generate company-wide comments narrative"""
+def generate_company_comments_narrative(combined_comments, team_names, sentiment_partial=None,
+                                        comment_index=None):
+    """Generate company-wide comments narrative, reusing sentiment counts and indexes built at ingest"""
     narrative = ""
 
-    combined_comments = pd.concat(all_comments_data, ignore_index=True) if all_comments_data else pd.DataFrame()
-
     if not combined_comments.empty:
-        comments_data, question_col, theme_col, comment_col = analyze_comments_data(combined_comments)
+        comments_df, question_col, theme_col, comment_col = analyze_comments_data(combined_comments)
 
-        if comments_data:
-            all_comments = [item['Comment'] for item in comments_data if item.get('Comment') and item['Comment'] != "No comment"]
+        if not comments_df.empty:
+            all_comments = comments_df['Comment']
 
-            if all_comments:
-                sentiment_analysis = analyze_comment_sentiment(all_comments)
-                insights = generate_comprehensive_insights(sentiment_analysis, all_comments)
+            if not all_comments.empty:
+                if sentiment_partial is not None and sentiment_partial['total_comments']:
+                    sentiment_analysis = finalize_sentiment(sentiment_partial)
+                else:
+                    sentiment_analysis = analyze_comment_sentiment(all_comments)
+                insights = generate_comprehensive_insights(sentiment_analysis, all_comments, comment_index)
 
                 narrative += f"Company-wide comment analysis across {len(all_comments)} comments from all teams:\n\n"
 
@@ -2106,92 +3190,555 @@ def show_manual_google_docs_method(report_content, report_title):
             help="Opens Google Docs in a new tab"
         )
 
-def analyze_comment_sentiment(comments_list):
-    """Analyze sentiment of comments without exposing actual content"""
-    if not comments_list:
-        return {
-            'total_comments': 0,
-            'positive_count': 0,
-            'negative_count': 0,
-            'neutral_count': 0,
-            'avg_length': 0,
-            'key_themes': []
-        }
-
-    positive_words = [
-        'good', 'great', 'excellent', 'amazing', 'wonderful', 'fantastic', 'outstanding', 'perfect',
-        'love', 'like', 'appreciate', 'satisfied', 'happy', 'pleased', 'impressed', 'positive',
-        'strong', 'effective', 'successful', 'helpful', 'supportive', 'clear', 'transparent',
-        'collaborative', 'innovative', 'efficient', 'smooth', 'well', 'better', 'improved',
-        'progress', 'growth', 'success', 'achievement', 'opportunity', 'benefit'
-    ]
-
-    negative_words = [
-        'bad', 'terrible', 'awful', 'horrible', 'disappointing', 'frustrating', 'annoying',
-        'hate', 'dislike', 'unsatisfied', 'unhappy', 'disappointed', 'concerned', 'worried',
-        'problem', 'issue', 'challenge', 'difficulty', 'confusion', 'unclear', 'poor',
-        'ineffective', 'unsuccessful', 'lacking', 'missing', 'insufficient', 'inadequate',
-        'slow', 'delayed', 'complicated', 'confusing', 'overwhelming', 'stressful'
-    ]
-
-    total_comments = len(comments_list)
-    positive_count = 0
-    negative_count = 0
-    neutral_count = 0
-    lengths = []
-
-    # Common themes extraction (anonymized)
-    theme_words = {
-        'communication': ['communication', 'communicate', 'talk', 'discuss', 'meeting', 'update'],
-        'leadership': ['leadership', 'leader', 'management', 'manager', 'direction', 'guidance'],
-        'teamwork': ['team', 'collaboration', 'together', 'support', 'help', 'cooperation'],
-        'processes': ['process', 'procedure', 'workflow', 'system', 'method', 'approach'],
-        'growth': ['growth', 'development', 'learning', 'training', 'skill', 'improve'],
-        'workload': ['workload', 'busy', 'time', 'deadline', 'pressure', 'stress'],
-        'resources': ['resource', 'tool', 'equipment', 'budget', 'funding', 'support'],
-        'culture': ['culture', 'environment', 'atmosphere', 'morale', 'values', 'mission']
+# Sentiment lexicons used by analyze_comment_sentiment
+SENTIMENT_POSITIVE_WORDS = [
+    'good', 'great', 'excellent', 'amazing', 'wonderful', 'fantastic', 'outstanding', 'perfect',
+    'love', 'like', 'appreciate', 'satisfied', 'happy', 'pleased', 'impressed', 'positive',
+    'strong', 'effective', 'successful', 'helpful', 'supportive', 'clear', 'transparent',
+    'collaborative', 'innovative', 'efficient', 'smooth', 'well', 'better', 'improved',
+    'progress', 'growth', 'success', 'achievement', 'opportunity', 'benefit'
+]
+
+SENTIMENT_NEGATIVE_WORDS = [
+    'bad', 'terrible', 'awful', 'horrible', 'disappointing', 'frustrating', 'annoying',
+    'hate', 'dislike', 'unsatisfied', 'unhappy', 'disappointed', 'concerned', 'worried',
+    'problem', 'issue', 'challenge', 'difficulty', 'confusion', 'unclear', 'poor',
+    'ineffective', 'unsuccessful', 'lacking', 'missing', 'insufficient', 'inadequate',
+    'slow', 'delayed', 'complicated', 'confusing', 'overwhelming', 'stressful'
+]
+
+# Common themes extraction (anonymized)
+COMMENT_THEME_WORDS = {
+    'communication': ['communication', 'communicate', 'talk', 'discuss', 'meeting', 'update'],
+    'leadership': ['leadership', 'leader', 'management', 'manager', 'direction', 'guidance'],
+    'teamwork': ['team', 'collaboration', 'together', 'support', 'help', 'cooperation'],
+    'processes': ['process', 'procedure', 'workflow', 'system', 'method', 'approach'],
+    'growth': ['growth', 'development', 'learning', 'training', 'skill', 'improve'],
+    'workload': ['workload', 'busy', 'time', 'deadline', 'pressure', 'stress'],
+    'resources': ['resource', 'tool', 'equipment', 'budget', 'funding', 'support'],
+    'culture': ['culture', 'environment', 'atmosphere', 'morale', 'values', 'mission']
+}
+
+SENTIMENT_LABELS = ['positive', 'negative', 'neutral']
+
+# Inflections matched for every lexicon term (improve -> improved, improvement)
+LEXICON_SUFFIXES = ['s', 'es', 'ed', 'ing', 'er', 'ers', 'ment', 'ments']
+SENTIMENT_TOKEN_PATTERN = re.compile(r"[a-z]+")
+# Comment search: parentheses and whitespace-separated words or operators
+SEARCH_QUERY_PATTERN = re.compile(r"\(|\)|[^\s()]+")
+COMMENT_SEARCH_MAX_ROWS = 500
+# Themes beyond this are shown only in the sortable theme x sentiment table
+THEME_SENTIMENT_MAX_CARDS = 10
+
+def inflect_term(term):
+    """A lexicon term and its regular inflected forms"""
+    forms = {term}
+    for suffix in LEXICON_SUFFIXES:
+        # Silent e is dropped before vowel suffixes (time -> timing, improve -> improved)
+        stem = term[:-1] if term.endswith('e') and suffix[0] in 'ei' else term
+        forms.add(stem + suffix)
+    if term.endswith('y'):
+        forms.update({term[:-1] + 'ies', term[:-1] + 'ied'})
+    return forms
+
+def compile_sentiment_lexicon(positive_words, negative_words, theme_words):
+    """Merge the sentiment and theme word lists into one token lookup"""
+    # Every term and inflected form maps to a (positive terms, negative terms, themes) tuple of frozensets
+    entries = {}
+
+    def add(term, slot, value):
+        for form in inflect_term(term):
+            entries.setdefault(form, (set(), set(), set()))[slot].add(value)
+
+    for word in positive_words:
+        add(word, 0, word)
+    for word in negative_words:
+        add(word, 1, word)
+    for theme, keywords in theme_words.items():
+        for keyword in keywords:
+            add(keyword, 2, theme)
+
+    return {form: tuple(frozenset(values) for values in entry) for form, entry in entries.items()}
+
+SENTIMENT_LEXICON = compile_sentiment_lexicon(
+    SENTIMENT_POSITIVE_WORDS, SENTIMENT_NEGATIVE_WORDS, COMMENT_THEME_WORDS
+)
+
+# Organizational themes and context words behind generate_comprehensive_insights
+INSIGHT_THEME_KEYWORDS = {
+    'workload_time': ['time', 'hours', 'workload', 'overload', 'busy', 'deadline', 'pressure', 'stress', 'overwhelmed', 'capacity', 'bandwidth'],
+    'clarity_vision': ['uncertainty', 'unclear', 'vision', 'direction', 'confused', 'clarity', 'priorities', 'goals', 'strategy', 'roadmap', 'purpose'],
+    'culture_engagement': ['culture', 'events', 'engagement', 'fun', 'team', 'connection', 'balance', 'office', 'workplace', 'morale', 'atmosphere'],
+    'communication': ['communication', 'feedback', 'transparent', 'updates', 'information', 'know', 'understand', 'listening', 'sharing'],
+    'growth_development': ['growth', 'development', 'learning', 'career', 'skills', 'opportunities', 'advancement', 'training', 'mentorship'],
+    'leadership_management': ['leadership', 'management', 'support', 'guidance', 'decision', 'leader', 'manager', 'supervisor'],
+    'resources_tools': ['resources', 'tools', 'budget', 'equipment', 'technology', 'support', 'infrastructure'],
+    'process_efficiency': ['process', 'efficiency', 'workflow', 'procedures', 'systems', 'organization', 'structure']
+}
+INSIGHT_POSITIVE_WORDS = ['good', 'great', 'excellent', 'positive', 'love', 'appreciate', 'satisfied']
+INSIGHT_NEGATIVE_WORDS = ['bad', 'poor', 'lack', 'need', 'problem', 'issue', 'concern', 'difficult']
+INSIGHT_LEXICON = compile_sentiment_lexicon(INSIGHT_POSITIVE_WORDS, INSIGHT_NEGATIVE_WORDS, INSIGHT_THEME_KEYWORDS)
+
+def match_comment_lexicon(comment_text, lexicon=SENTIMENT_LEXICON):
+    """Distinct positive and negative term counts and matched themes of a lowercased comment"""
+    positive, negative, themes = set(), set(), set()
+    for token in set(SENTIMENT_TOKEN_PATTERN.findall(comment_text)):
+        entry = lexicon.get(token)
+        if entry is not None:
+            positive |= entry[0]
+            negative |= entry[1]
+            themes |= entry[2]
+    return len(positive), len(negative), frozenset(themes)
+
+@st.cache_resource(show_spinner=False)
+def get_sentiment_cache():
+    """Get the shared cache of lexicon matches, keyed by normalized comment text hash"""
+    return create_lru_cache(SENTIMENT_CACHE_MAX_ENTRIES, SENTIMENT_CACHE_MAX_BYTES)
+
+def get_comment_key(comment_text):
+    """Cache key of a lowercased comment: a hash of its whitespace-normalized text"""
+    # Matching only looks at tokens, so comments differing in spacing share a key
+    return hashlib.blake2b(' '.join(comment_text.split()).encode(), digest_size=16).digest()
+
+def match_comment_cached(comment_text, cache):
+    """Lexicon match of a lowercased comment, reusing the result of an identical comment"""
+    key = get_comment_key(comment_text)
+    match = lru_cache_get(cache, key)
+    if match is None:
+        match = match_comment_lexicon(comment_text)
+        lru_cache_put(cache, key, match, SENTIMENT_CACHE_ENTRY_BYTES)
+    return match
+
+def empty_sentiment_partial():
+    """Create empty, mergeable sentiment counts"""
+    return {
+        'total_comments': 0,
+        'positive_count': 0,
+        'negative_count': 0,
+        'neutral_count': 0,
+        'length_sum': 0,
+        'length_count': 0,
+        'theme_mentions': {theme: 0 for theme in COMMENT_THEME_WORDS}
     }
 
-    theme_mentions = {theme: 0 for theme in theme_words.keys()}
-
-    for comment in comments_list:
-        if pd.isna(comment) or str(comment).strip() == '':
-            continue
+def get_theme_hit_column(theme):
+    """Name of the per-comment theme hit column in score_comments results"""
+    return f"theme_{theme}"
+
+def score_comments(comments, shared_cache=True):
+    """Score a column of comments into per-comment sentiment and theme-hit columns"""
+    # Any array-like works (e.g. an Arrow array); the result is aligned with it
+    if not isinstance(comments, pd.Series):
+        comments = pd.Series(comments, dtype=object)
+
+    text = comments.astype(str).str.lower()
+    valid = (comments.notna() & (text.str.strip() != '')).to_numpy()
+    # Identical texts are matched against the lexicon only once
+    codes, unique_texts = pd.factorize(text[valid])
+
+    themes = list(COMMENT_THEME_WORDS)
+    unique_positive = np.zeros(len(unique_texts), dtype='int32')
+    unique_negative = np.zeros(len(unique_texts), dtype='int32')
+    unique_hits = np.zeros((len(unique_texts), len(themes)), dtype=bool)
+    theme_positions = {theme: position for position, theme in enumerate(themes)}
+    # Pool workers pass shared_cache=False: a forked copy of the cache's lock may be held
+    cache = get_sentiment_cache() if shared_cache else None
+    for position, comment_text in enumerate(unique_texts):
+        if cache is not None:
+            match = match_comment_cached(comment_text, cache)
+        else:
+            match = match_comment_lexicon(comment_text)
+        unique_positive[position], unique_negative[position], matched = match
+        for theme in matched:
+            unique_hits[position, theme_positions[theme]] = True
+    if cache is not None:
+        logger.debug("Sentiment cache: %(entries)d entries, %(hits)d hits, %(misses)d misses",
+                     lru_cache_stats(cache))
+
+    positive = np.zeros(len(comments), dtype='int32')
+    negative = np.zeros(len(comments), dtype='int32')
+    hits = np.zeros((len(comments), len(themes)), dtype=bool)
+    positive[valid] = unique_positive[codes]
+    negative[valid] = unique_negative[codes]
+    hits[valid] = unique_hits[codes]
+
+    lengths = np.where(valid, text.str.len().to_numpy(), 0).astype('int64')
+    return build_comment_scores(lengths, valid, positive, negative, hits, comments.index)
+
+def build_comment_scores(lengths, valid, positive, negative, hits, index=None):
+    """Assemble per-comment score arrays into the score_comments DataFrame"""
+    labels = np.select([positive > negative, negative > positive], ['positive', 'negative'], 'neutral')
+    # Blank comments get no sentiment label
+    sentiment = pd.Categorical(np.where(valid, labels, None), categories=SENTIMENT_LABELS)
+
+    scores = pd.DataFrame({
+        'length': lengths,
+        'positive': positive,
+        'negative': negative,
+        'sentiment': sentiment
+    }, index=index)
+    for position, theme in enumerate(COMMENT_THEME_WORDS):
+        scores[get_theme_hit_column(theme)] = hits[:, position]
+    return scores
+
+def build_comment_index(comments):
+    """Build a document-term index over a column of comments, tokenizing each distinct text once"""
+    if not isinstance(comments, pd.Series):
+        comments = pd.Series(comments, dtype=object)
+
+    text = comments.astype(str).str.lower()
+    valid = (comments.notna() & (text.str.strip() != '')).to_numpy()
+    codes, unique_texts = pd.factorize(text[valid])
+
+    vocabulary = {}
+    unique_ids = []
+    unique_sizes = np.zeros(len(unique_texts), dtype='int64')
+    for position, comment_text in enumerate(unique_texts):
+        ids = {vocabulary.setdefault(token, len(vocabulary))
+               for token in SENTIMENT_TOKEN_PATTERN.findall(comment_text)}
+        unique_ids.extend(ids)
+        unique_sizes[position] = len(ids)
+    unique_ids = np.array(unique_ids, dtype='int32')
+    unique_starts = np.cumsum(unique_sizes) - unique_sizes
+
+    # Expand the distinct texts back to one row per comment
+    sizes = np.zeros(len(comments), dtype='int64')
+    starts = np.zeros(len(comments), dtype='int64')
+    sizes[valid] = unique_sizes[codes]
+    starts[valid] = unique_starts[codes]
+    indptr = np.concatenate([[0], np.cumsum(sizes)])
+    offsets = np.arange(indptr[-1]) - np.repeat(indptr[:-1], sizes)
+
+    # CSR layout: comment i holds the distinct term ids term_ids[indptr[i]:indptr[i + 1]],
+    # which point into vocabulary; lengths and the non-blank mask spare later string scans
+    return {
+        'indptr': indptr,
+        'term_ids': unique_ids[np.repeat(starts, sizes) + offsets],
+        'vocabulary': np.array(list(vocabulary), dtype=object),
+        'lengths': np.where(valid, text.str.len().to_numpy(), 0).astype('int64'),
+        'valid': valid
+    }
 
-        comment_text = str(comment).lower()
-        lengths.append(len(comment_text))
+def concat_comment_indexes(indexes):
+    """Stack comment indexes row-wise, remapping their terms onto one vocabulary"""
+    vocabulary = {}
+    indptrs, term_ids = [], []
+    offset = 0
+    for index in indexes:
+        mapping = np.array([vocabulary.setdefault(term, len(vocabulary)) for term in index['vocabulary']],
+                           dtype='int32')
+        term_ids.append(mapping[index['term_ids']] if len(mapping) else index['term_ids'])
+        indptrs.append(index['indptr'][1:] + offset)
+        offset += index['indptr'][-1]
 
-        # Count positive and negative words
-        pos_score = sum(1 for word in positive_words if word in comment_text)
-        neg_score = sum(1 for word in negative_words if word in comment_text)
+    return {
+        'indptr': np.concatenate([[0]] + indptrs).astype('int64'),
+        'term_ids': np.concatenate(term_ids) if term_ids else np.zeros(0, dtype='int32'),
+        'vocabulary': np.array(list(vocabulary), dtype=object),
+        'lengths': np.concatenate([index['lengths'] for index in indexes]) if indexes else np.zeros(0, dtype='int64'),
+        'valid': np.concatenate([index['valid'] for index in indexes]) if indexes else np.zeros(0, dtype=bool)
+    }
 
-        # Classify sentiment
-        if pos_score > neg_score:
-            positive_count += 1
-        elif neg_score > pos_score:
-            negative_count += 1
-        else:
-            neutral_count += 1
+def get_index_rows(index):
+    """Comment row of every term entry of an index"""
+    return np.repeat(np.arange(len(index['indptr']) - 1), np.diff(index['indptr']))
+
+def reduce_index_lexicon(index, lexicon, slot):
+    """Distinct (comment row, value code) pairs and value names an index reaches through one lexicon slot"""
+    # Slots of a lexicon entry: positive terms (0), negative terms (1), themes (2)
+    pair_terms, pair_values = [], []
+    for term_id, term in enumerate(index['vocabulary']):
+        entry = lexicon.get(term)
+        if entry is not None:
+            for value in entry[slot]:
+                pair_terms.append(term_id)
+                pair_values.append(value)
+    if not pair_terms:
+        return np.zeros(0, dtype='int64'), np.zeros(0, dtype='int64'), []
+
+    value_codes, value_names = pd.factorize(pd.Series(pair_values, dtype=object))
+    order = np.argsort(pair_terms, kind='stable')
+    pair_terms = np.array(pair_terms, dtype='int64')[order]
+    value_codes = value_codes[order]
+
+    # Each term entry fans out to every value its term stands for
+    left = np.searchsorted(pair_terms, index['term_ids'], 'left')
+    fanout = np.searchsorted(pair_terms, index['term_ids'], 'right') - left
+    rows = np.repeat(get_index_rows(index), fanout)
+    offsets = np.arange(fanout.sum()) - np.repeat(np.cumsum(fanout) - fanout, fanout)
+    values = value_codes[np.repeat(left, fanout) + offsets]
+
+    keys = np.unique(rows * len(value_names) + values)
+    return keys // len(value_names), keys % len(value_names), list(value_names)
+
+def match_comment_index(index, lexicon, themes):
+    """Per-comment distinct positive and negative term counts and theme hits of an index"""
+    comment_count = len(index['indptr']) - 1
+    counts = []
+    for slot in (0, 1):
+        rows, _, _ = reduce_index_lexicon(index, lexicon, slot)
+        counts.append(np.bincount(rows, minlength=comment_count).astype('int32'))
+
+    hits = np.zeros((comment_count, len(themes)), dtype=bool)
+    rows, values, names = reduce_index_lexicon(index, lexicon, 2)
+    theme_positions = np.array([list(themes).index(name) for name in names], dtype='int64')
+    if len(rows):
+        hits[rows, theme_positions[values]] = True
+    return counts[0], counts[1], hits
+
+def score_comment_index(index):
+    """Score the comments of an index, like score_comments, with vectorized reductions only"""
+    positive, negative, hits = match_comment_index(index, SENTIMENT_LEXICON, COMMENT_THEME_WORDS)
+    return build_comment_scores(index['lengths'], index['valid'], positive, negative, hits)
+
+def build_inverted_index(comment_index):
+    """Invert a comment index into postings: the ascending comment rows of every term"""
+    term_ids = comment_index['term_ids']
+    order = np.argsort(term_ids, kind='stable')
+    counts = np.bincount(term_ids, minlength=len(comment_index['vocabulary']))
+    # Rows containing term t are postings[term_indptr[t]:term_indptr[t + 1]]
+    return {
+        'postings': get_index_rows(comment_index)[order],
+        'term_indptr': np.concatenate([[0], np.cumsum(counts)]),
+        'lookup': {term: term_id for term_id, term in enumerate(comment_index['vocabulary'])},
+        'comment_count': len(comment_index['indptr']) - 1
+    }
 
-        # Count theme mentions
-        for theme, keywords in theme_words.items():
-            if any(keyword in comment_text for keyword in keywords):
-                theme_mentions[theme] += 1
+def get_term_postings(inverted, terms):
+    """Boolean mask of the comments containing any of the given terms"""
+    mask = np.zeros(inverted['comment_count'], dtype=bool)
+    for term in terms:
+        term_id = inverted['lookup'].get(term)
+        if term_id is not None:
+            mask[inverted['postings'][inverted['term_indptr'][term_id]:inverted['term_indptr'][term_id + 1]]] = True
+    return mask
+
+def expand_search_word(inverted, word):
+    """Index terms a lowercased query word stands for"""
+    # theme:<name> stands for every keyword of a comment theme
+    if word.startswith('theme:'):
+        keywords = COMMENT_THEME_WORDS.get(word[len('theme:'):])
+        if keywords is None:
+            raise ValueError(f"Unknown theme '{word[len('theme:'):]}'. Choose one of: {', '.join(COMMENT_THEME_WORDS)}")
+        return {form for keyword in keywords for form in inflect_term(keyword)}
+    # A trailing '*' matches by prefix, and lexicon terms also match their inflections
+    if word.endswith('*'):
+        return {term for term in inverted['lookup'] if term.startswith(word[:-1])}
+    if word in SENTIMENT_LEXICON or word in INSIGHT_LEXICON:
+        return inflect_term(word)
+    return {word}
+
+def search_comment_index(inverted, query):
+    """Evaluate a keyword query over an inverted index into a boolean comment mask"""
+    # Words are ANDed by default; AND, OR, NOT (in capitals) and parentheses combine
+    # them, e.g. "workload AND (deadline OR theme:growth) NOT meeting". Malformed
+    # queries raise ValueError.
+    tokens = SEARCH_QUERY_PATTERN.findall(query)
+    position = 0
+
+    def peek():
+        return tokens[position] if position < len(tokens) else None
+
+    def parse_or():
+        nonlocal position
+        mask = parse_and()
+        while peek() == 'OR':
+            position += 1
+            mask = mask | parse_and()
+        return mask
+
+    def parse_and():
+        nonlocal position
+        mask = parse_not()
+        while peek() not in (None, 'OR', ')'):
+            if peek() == 'AND':
+                position += 1
+            mask = mask & parse_not()
+        return mask
+
+    def parse_not():
+        nonlocal position
+        if peek() == 'NOT':
+            position += 1
+            return ~parse_not()
+        return parse_atom()
+
+    def parse_atom():
+        nonlocal position
+        token = peek()
+        if token in (None, ')', 'AND', 'OR'):
+            raise ValueError("Expected a search word" + (f" before '{token}'" if token else " at the end"))
+        position += 1
+        if token == '(':
+            mask = parse_or()
+            if peek() != ')':
+                raise ValueError("Missing closing parenthesis")
+            position += 1
+            return mask
+
+        word = token.lower()
+        if word.startswith('theme:') or word.endswith('*'):
+            return get_term_postings(inverted, expand_search_word(inverted, word))
+        # Words are tokenized like comments; "e-mail" needs both of its tokens
+        words = SENTIMENT_TOKEN_PATTERN.findall(word)
+        if not words:
+            raise ValueError(f"Nothing to search for in '{token}'")
+        mask = np.ones(inverted['comment_count'], dtype=bool)
+        for part in words:
+            mask &= get_term_postings(inverted, expand_search_word(inverted, part))
+        return mask
+
+    if not tokens:
+        return np.ones(inverted['comment_count'], dtype=bool)
+    mask = parse_or()
+    if peek() is not None:
+        raise ValueError(f"Unexpected '{peek()}'")
+    return mask
+
+def get_entries_comment_index(entries, combined_df):
+    """Stacked comment index of the file entries making up a combined frame, or None if they don't line up"""
+    # Entries index their own frame's comments, which match the combined frame's
+    # only when every entry has the same comment column
+    comment_col = get_column_schema(combined_df)['roles']['comment']
+    if not entries or any(file_info.get('comment_index') is None or
+                          file_info['schema']['roles']['comment'] != comment_col
+                          for file_info in entries):
+        return None
+    return concat_comment_indexes([file_info['comment_index'] for file_info in entries])
+
+def summarize_sentiment_scores(scores, by=None):
+    """Mergeable sentiment counts of scored comments, overall or per group of keys"""
+    valid = scores['sentiment'].notna()
+    counts = pd.DataFrame({
+        'total_comments': np.ones(len(scores), dtype='int64'),
+        'positive_count': scores['sentiment'].eq('positive'),
+        'negative_count': scores['sentiment'].eq('negative'),
+        'neutral_count': scores['sentiment'].eq('neutral'),
+        'length_sum': scores['length'],
+        'length_count': valid
+    }, index=scores.index)
+    for theme in COMMENT_THEME_WORDS:
+        counts[get_theme_hit_column(theme)] = scores[get_theme_hit_column(theme)]
+
+    if by is not None:
+        # Group keys are aligned with the scores; groups keep their order of first appearance
+        by = pd.Series(by, index=scores.index)
+        summary = counts.groupby(by, observed=True, sort=False).sum().astype('int64')
+        return summary.reindex(by.drop_duplicates().dropna())
+
+    totals = counts.sum()
+    partial = empty_sentiment_partial()
+    for key in ('total_comments', 'positive_count', 'negative_count', 'neutral_count',
+                'length_sum', 'length_count'):
+        partial[key] = int(totals[key])
+    partial['theme_mentions'] = {theme: int(totals[get_theme_hit_column(theme)])
+                                 for theme in COMMENT_THEME_WORDS}
+    return partial
+
+def build_theme_sentiment_table(theme_summary):
+    """Theme x sentiment table from per-theme counts, most positive themes first"""
+    # Statuses follow the theme cards: over 60% positive, under 40% needs attention, otherwise mixed
+    summary = theme_summary.drop(index='Not specified', errors='ignore')
+    totals = summary['total_comments']
+    positive_pct = (summary['positive_count'] / totals.where(totals > 0) * 100).fillna(0)
+    table = pd.DataFrame({
+        'Theme': summary.index.astype(str),
+        'Comments': totals.to_numpy(),
+        'Positive': summary['positive_count'].to_numpy(),
+        'Negative': summary['negative_count'].to_numpy(),
+        'Neutral': summary['neutral_count'].to_numpy(),
+        'Positive %': positive_pct.to_numpy(),
+        'Status': np.select([positive_pct.to_numpy() > 60, positive_pct.to_numpy() < 40],
+                            ['Positive', 'Needs Attention'], 'Mixed')
+    })
+    return table.sort_values(['Positive %', 'Comments'], ascending=[False, False], kind='stable',
+                             ignore_index=True)
+
+def score_sentiment_partial(comments_list, shared_cache=True):
+    """Count sentiment, lengths and theme mentions for a batch of comments"""
+    return summarize_sentiment_scores(score_comments(comments_list, shared_cache))
+
+def merge_sentiment_partials(partials):
+    """Combine sentiment counts from several batches of comments"""
+    merged = empty_sentiment_partial()
+    for partial in partials:
+        for key in ('total_comments', 'positive_count', 'negative_count', 'neutral_count',
+                    'length_sum', 'length_count'):
+            merged[key] += partial[key]
+        for theme, count in partial['theme_mentions'].items():
+            merged['theme_mentions'][theme] = merged['theme_mentions'].get(theme, 0) + count
+    return merged
+
+def finalize_sentiment(partial):
+    """Turn merged sentiment counts into the analyze_comment_sentiment result"""
+    theme_mentions = dict(partial['theme_mentions'])
 
     # Get top themes
     top_themes = sorted(theme_mentions.items(), key=lambda x: x[1], reverse=True)[:3]
     key_themes = [theme for theme, count in top_themes if count > 0]
 
     return {
-        'total_comments': total_comments,
-        'positive_count': positive_count,
-        'negative_count': negative_count,
-        'neutral_count': neutral_count,
-        'avg_length': sum(lengths) / len(lengths) if lengths else 0,
+        'total_comments': partial['total_comments'],
+        'positive_count': partial['positive_count'],
+        'negative_count': partial['negative_count'],
+        'neutral_count': partial['neutral_count'],
+        'avg_length': partial['length_sum'] / partial['length_count'] if partial['length_count'] else 0,
         'key_themes': key_themes,
         'theme_distribution': theme_mentions
     }
 
+def score_partials_in_pool(chunks, max_workers):
+    """Score comment chunks in a process pool, returning their sentiment counts in chunk order"""
+    partials = [None] * len(chunks)
+    with ProcessPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+        # A forked worker may inherit the shared cache's lock held by another session's
+        # thread, so workers match against the lexicon without it
+        futures = {executor.submit(score_sentiment_partial, chunk, False): index
+                   for index, chunk in enumerate(chunks)}
+        for future in as_completed(futures):
+            partials[futures[future]] = future.result()
+    return partials
+
+def score_sentiment_parallel(comments, parallel=None):
+    """Count sentiment for a comment column, in a process pool when it is large"""
+    # Every count is a plain sum, so merging the workers' chunk counts gives exactly the serial result
+    if not isinstance(comments, pd.Series):
+        comments = pd.Series(comments, dtype=object)
+    if parallel is None:
+        parallel = SENTIMENT_WORKERS > 1 and len(comments) >= PARALLEL_SENTIMENT_MIN_COMMENTS
+
+    chunks = [comments.iloc[start:start + SENTIMENT_CHUNK_COMMENTS]
+              for start in range(0, len(comments), SENTIMENT_CHUNK_COMMENTS)]
+    if parallel and len(chunks) > 1:
+        try:
+            return merge_sentiment_partials(score_partials_in_pool(chunks, max(SENTIMENT_WORKERS, 1)))
+        except Exception:
+            # Pool unavailable (e.g. restricted environment) - score serially instead
+            pass
+    return score_sentiment_partial(comments)
+
+def analyze_comment_sentiment(comments_list):
+    """Analyze sentiment of comments (a list or Series) without exposing actual content"""
+    if len(comments_list) == 0:
+        return {
+            'total_comments': 0,
+            'positive_count': 0,
+            'negative_count': 0,
+            'neutral_count': 0,
+            'avg_length': 0,
+            'key_themes': []
+        }
+
+    return finalize_sentiment(score_sentiment_parallel(comments_list))
+
+def get_precomputed_sentiment(files):
+    """Merge sentiment counts computed at ingest, or None if any file lacks them"""
+    partials = [file_info.get('sentiment') for file_info in files]
+    if not partials or any(partial is None for partial in partials):
+        return None
+    merged = merge_sentiment_partials(partials)
+    return finalize_sentiment(merged) if merged['total_comments'] else None
+
 def show_team_comments_analysis(team_data, team_name):
     """Show comments analysis for a specific team"""
     st.markdown(f"""
@@ -2213,10 +3760,8 @@ def show_team_comments_analysis(team_data, team_name):
         st.markdown(f"**📁 Data Sources:** {', '.join(source_files)}")
         st.markdown("---")
 
-    # Look for comment columns
-    comment_columns = [col for col in filtered_df.columns
-                      if any(keyword in col.lower() for keyword in
-                      ['comment', 'feedback', 'response', 'text', 'opinion', 'note']) and not col.startswith('_')]
+    # Comment columns
+    comment_columns = get_column_schema(filtered_df)['comment_columns']
 
     # If no specific comment columns found, look for text columns
     if not comment_columns:
@@ -2226,26 +3771,23 @@ def show_team_comments_analysis(team_data, team_name):
                          col.lower() not in ['team', 'name', 'id']]
 
     # Try to use the new row-based structure first
-    comments_data, question_col, theme_col, comment_col = analyze_comments_data(filtered_df)
+    comments_df, question_col, theme_col, comment_col = analyze_comments_data(filtered_df)
 
-    if comments_data:
+    if not comments_df.empty:
         st.markdown("### 📝 Comments & Sentiment Analysis")
 
-        # Collect all comments for sentiment analysis
-        all_comments = []
-        theme_comments = {}
-
-        for item in comments_data:
-            if item.get('Comment') and item['Comment'] != "No comment":
-                all_comments.append(item['Comment'])
-                theme = item.get('Theme', 'Not specified')
-                if theme not in theme_comments:
-                    theme_comments[theme] = []
-                theme_comments[theme].append(item['Comment'])
+        # Per-comment scores come from the ingest index; the team and theme figures aggregate them
+        comment_index, inverted_index = get_team_comment_index(team_data, team_name, filtered_df)
+        if comment_index is not None:
+            comment_scores = score_comment_index(comment_index)
+        else:
+            comment_scores = score_comments(comments_df['Comment'])
+            inverted_index = build_inverted_index(build_comment_index(comments_df['Comment']))
 
-        if all_comments:
-            # Perform sentiment analysis
-            sentiment_analysis = analyze_comment_sentiment(all_comments)
+        if not comment_scores.empty:
+            # Perform sentiment analysis (reusing counts from ingestion when available)
+            sentiment_analysis = (get_precomputed_sentiment(team_data[team_name]['Comments']) or
+                                  finalize_sentiment(summarize_sentiment_scores(comment_scores)))
 
             # Display overview metrics
             col1, col2, col3, col4 = st.columns(4)
@@ -2299,30 +3841,45 @@ def show_team_comments_analysis(team_data, team_name):
             st.markdown("---")
 
             # Theme-based sentiment breakdown
-            if len(theme_comments) > 1:
+            theme_summary = summarize_sentiment_scores(comment_scores, comments_df['Theme'])
+            if len(theme_summary) > 1:
                 st.markdown("### 🎯 Sentiment by Theme")
+                theme_table = build_theme_sentiment_table(theme_summary)
 
-                for theme, comments in theme_comments.items():
-                    if theme != 'Not specified':
-                        theme_sentiment = analyze_comment_sentiment(comments)
-                        theme_positive_pct = theme_sentiment['positive_count'] / theme_sentiment['total_comments'] * 100 if theme_sentiment['total_comments'] > 0 else 0
+                # Cards only for a handful of themes; larger sets are read from the sortable table
+                if len(theme_table) <= THEME_SENTIMENT_MAX_CARDS:
+                    theme_cards = theme_table.set_index('Theme')
+                    for theme in theme_summary.index.astype(str).drop('Not specified', errors='ignore'):
+                        theme_sentiment = theme_cards.loc[theme]
+                        theme_positive_pct = theme_sentiment['Positive %']
 
                         if theme_positive_pct > 60:
                             theme_icon = "✅"
-                            theme_status = "Positive"
                         elif theme_positive_pct < 40:
                             theme_icon = "⚠️"
-                            theme_status = "Needs Attention"
                         else:
                             theme_icon = "ℹ️"
-                            theme_status = "Mixed"
 
                         st.markdown(f"""
                         <div class="tab-info-card {'success' if theme_positive_pct > 60 else 'warning' if theme_positive_pct < 40 else 'info'}">
-                            <strong>{theme_icon} {theme}</strong> - {theme_status}<br>
-                            <small>{theme_sentiment['total_comments']} comments | {theme_positive_pct:.0f}% positive sentiment</small>
+                            <strong>{theme_icon} {theme}</strong> - {theme_sentiment['Status']}<br>
+                            <small>{theme_sentiment['Comments']} comments | {theme_positive_pct:.0f}% positive sentiment</small>
                         </div>
                         """, unsafe_allow_html=True)
+
+                st.dataframe(
+                    theme_table,
+                    width='stretch',
+                    hide_index=True,
+                    column_config={
+                        "Theme": st.column_config.TextColumn("Theme", width="large"),
+                        "Positive %": st.column_config.ProgressColumn("Positive %", format="%.0f%%",
+                                                                      min_value=0, max_value=100)
+                    }
+                )
+
+            st.markdown("---")
+            show_comment_search(comments_df, inverted_index, key=team_name)
         else:
             st.info("Comments detected but no text content found for analysis.")
 
@@ -2402,7 +3959,7 @@ def show_insights_section(categorized_data, team_filter, all_teams):
         if 'Score' in filtered_df.columns:
             try:
                 # Try to convert to numeric and calculate mean
-                numeric_scores = pd.to_numeric(filtered_df['Score'], errors='coerce')
+                numeric_scores = get_numeric_scores(filtered_df, 'Score')
                 avg_score = numeric_scores.mean() if not numeric_scores.isna().all() else 0
             except:
                 avg_score = 0
@@ -2479,11 +4036,8 @@ def show_themes_section(categorized_data, team_filter, all_teams):
                 # Create a clean dataframe with proper data types
                 theme_df = filtered_df[['Theme', 'Score']].copy()
 
-                # Convert scores to numeric, keeping original values for display
-                theme_df['Score_Display'] = theme_df['Score'].astype(str)
-
-                # Try to convert to numeric for those that can be converted
-                numeric_scores = pd.to_numeric(theme_df['Score'], errors='coerce')
+                # Show numeric scores (rounded, as stored in float32) and keep other values as text
+                numeric_scores = get_numeric_scores(filtered_df, 'Score').astype('float64').round(2)
                 theme_df['Score_Display'] = numeric_scores.combine_first(theme_df['Score'].astype(str))
 
                 # Remove rows where both Theme and Score are null
@@ -2515,14 +4069,13 @@ def show_themes_section(categorized_data, team_filter, all_teams):
         if 'Score' in filtered_df.columns:
             try:
                 # Convert scores to numeric and group by theme
-                filtered_df_copy = filtered_df.copy()
-                filtered_df_copy['Score_Numeric'] = pd.to_numeric(filtered_df_copy['Score'], errors='coerce')
-
                 # Only include rows with valid numeric scores
-                valid_scores = filtered_df_copy.dropna(subset=['Score_Numeric', 'Theme'])
+                valid_scores = filtered_df[['Theme']].assign(
+                    Score_Numeric=get_numeric_scores(filtered_df, 'Score')
+                ).dropna(subset=['Score_Numeric', 'Theme'])
 
                 if not valid_scores.empty:
-                    theme_scores = valid_scores.groupby('Theme')['Score_Numeric'].mean().sort_values(ascending=False).head(10)
+                    theme_scores = valid_scores.groupby('Theme', observed=True)['Score_Numeric'].mean().sort_values(ascending=False).head(10)
 
                     if not theme_scores.empty:
                         fig = px.bar(
@@ -2562,10 +4115,8 @@ def show_comments_section(categorized_data, team_filter, all_teams):
         st.markdown("---")
 
     if not filtered_df.empty:
-        # Look for comment columns (more comprehensive search)
-        comment_columns = [col for col in filtered_df.columns
-                          if any(keyword in col.lower() for keyword in
-                          ['comment', 'feedback', 'response', 'text', 'opinion', 'note'])]
+        # Comment columns
+        comment_columns = get_column_schema(filtered_df)['comment_columns']
 
         # If no specific comment columns found, look for text columns
         if not comment_columns:
@@ -2596,7 +4147,7 @@ def show_comments_section(categorized_data, team_filter, all_teams):
 
                     # Show team breakdown if available
                     if '_detected_team' in filtered_df.columns and team_filter == "All Teams":
-                        team_comments = filtered_df.groupby('_detected_team')[col].count()
+                        team_comments = filtered_df.groupby('_detected_team', observed=True)[col].count()
                         team_summary = ", ".join([f"{team}: {count}" for team, count in team_comments.items() if pd.notna(team)])
                         if team_summary:
                             st.markdown(f"**Team Breakdown:** {team_summary}")
@@ -2638,16 +4189,17 @@ def show_questions_section(categorized_data, team_filter, all_teams):
     st.markdown("### 📊 Questions Overview")
 
     # Use new questions analysis function
-    questions_data, question_col, theme_col, score_col = analyze_questions_data(filtered_df)
+    questions_df, question_col, theme_col, score_col = analyze_questions_data(filtered_df)
 
     # Show data structure detection
     st.markdown(f"**📋 Data Structure Detected:**")
-    st.markdown(f"- **Questions Column:** {question_col or '❌ Not found'}")
-    st.markdown(f"- **Theme Column:** {theme_col or '❌ Not found'}")
-    st.markdown(f"- **Score Column:** {score_col or '❌ Not found'}")
+    schema = get_column_schema(filtered_df)
+    st.markdown(f"- **Questions Column:** {describe_schema_column(schema, 'question')}")
+    st.markdown(f"- **Theme Column:** {describe_schema_column(schema, 'theme')}")
+    st.markdown(f"- **Score Column:** {describe_schema_column(schema, 'score')}")
     st.markdown("---")
 
-    if not questions_data:
+    if questions_df.empty:
         st.info("Expected Excel format: Each row should contain a question/affirmation with columns for Question, Theme, and Score")
         st.markdown("**Available columns in your data:**")
         for col in filtered_df.columns:
@@ -2655,18 +4207,21 @@ def show_questions_section(categorized_data, team_filter, all_teams):
                 st.markdown(f"- {col}")
         return
 
-    st.markdown(f"**📊 Found {len(questions_data)} questions/affirmations**")
+    st.markdown(f"**📊 Found {len(questions_df)} questions/affirmations**")
 
-    if questions_data:
-        # Display enhanced questions table
-        questions_df = pd.DataFrame(questions_data)
-        st.dataframe(questions_df, width='stretch')
+    if not questions_df.empty:
+        # Display enhanced questions table; scores stay numeric so the column sorts
+        st.dataframe(
+            questions_df,
+            width='stretch',
+            column_config={"Score": st.column_config.NumberColumn("Score", format="%.2f")}
+        )
 
         # Show detailed question cards for better readability
         st.markdown("### 📋 Detailed Questions Analysis")
 
         # Add theme filter
-        themes = list(set([q['Theme'] for q in questions_data if q['Theme'] != 'Not specified']))
+        themes = [theme for theme in questions_df['Theme'].unique() if theme != 'Not specified']
         if themes:
             st.markdown("### 🔍 Filter by Theme")
             selected_theme = st.selectbox(
@@ -2676,41 +4231,33 @@ def show_questions_section(categorized_data, team_filter, all_teams):
             )
 
             if selected_theme != 'All themes':
-                questions_data = [q for q in questions_data if q['Theme'] == selected_theme]
-                st.markdown(f"**Filtered to {len(questions_data)} questions for theme: {selected_theme}**")
+                questions_df = questions_df[questions_df['Theme'] == selected_theme]
+                st.markdown(f"**Filtered to {len(questions_df)} questions for theme: {selected_theme}**")
 
         # Sort alphabetically by affirmation
-        questions_data_sorted = sorted(questions_data, key=lambda x: x['Affirmation'])
+        questions_sorted = questions_df.sort_values('Affirmation', kind='stable')
 
         # Display questions in card format grouped by theme
         current_theme = None
-        for question in questions_data_sorted:
+        for affirmation, theme, score in questions_sorted.itertuples(index=False):
             # Group by theme
-            if question['Theme'] != current_theme:
-                current_theme = question['Theme']
+            if theme != current_theme:
+                current_theme = theme
                 st.markdown(f"#### 🎯 {current_theme}")
 
-            # Determine card style based on score (try to parse score for styling)
+            # Card style follows the score
             card_style = "info"
-            score_display = ""
-
-            # Try to determine numeric value for styling
-            try:
-                if question['Score'] != "No score":
-                    score_numeric = pd.to_numeric(question['Score'], errors='coerce')
-                    if pd.notna(score_numeric):
-                        if score_numeric >= 4.0:
-                            card_style = "success"
-                        elif score_numeric <= 2.5:
-                            card_style = "warning"
-                score_display = f"<div style='font-size: 1.2rem; font-weight: 700; color: #667eea; margin: 0.5rem 0;'>📊 Score: {question['Score']}</div>"
-            except:
-                score_display = f"<div style='font-size: 1rem; color: #64748b; margin: 0.5rem 0;'>📊 {question['Score']}</div>"
+            if pd.notna(score):
+                if score >= 4.0:
+                    card_style = "success"
+                elif score <= 2.5:
+                    card_style = "warning"
+            score_display = f"<div style='font-size: 1.2rem; font-weight: 700; color: #667eea; margin: 0.5rem 0;'>📊 Score: {format_question_score(score)}</div>"
 
             st.markdown(f"""
             <div class="tab-info-card {card_style}">
                 <div style="font-weight: 700; font-size: 1.1rem; margin-bottom: 0.5rem; color: #2c3e50;">
-                    💬 {question['Affirmation']}
+                    💬 {affirmation}
                 </div>
                 {score_display}
             </div>
@@ -2718,7 +4265,7 @@ def show_questions_section(categorized_data, team_filter, all_teams):
     else:
         st.info("No valid question data found for analysis.")
 
-def show_company_wide_analysis(team_data):
+def show_company_wide_analysis(team_data, ingestion_state=None):
     """Show company-wide analysis across all teams"""
     st.markdown("""
     <div class="section-header fade-in-up">
@@ -2727,35 +4274,12 @@ def show_company_wide_analysis(team_data):
     </div>
     """, unsafe_allow_html=True)
 
-    # Aggregate data from all teams
-    all_themes_data = []
-    all_questions_data = []
-    all_comments_data = []
-
-    team_names = ["Andrew's Team", 'Build Team', 'People and Marketing Team', 'Finance and Operations Team']
+    # Consolidated data from all teams, one store per section
+    themes_store = get_section_store(team_data, 'Themes')
+    questions_store = get_section_store(team_data, 'Questions')
+    comments_store = get_section_store(team_data, 'Comments')
 
-    for team_name in team_names:
-        if team_name in team_data:
-            # Collect themes data
-            for file_info in team_data[team_name].get('Themes', []):
-                if 'data' in file_info and not file_info['data'].empty:
-                    df_copy = file_info['data'].copy()
-                    df_copy['_team_source'] = team_name
-                    all_themes_data.append(df_copy)
-
-            # Collect questions data
-            for file_info in team_data[team_name].get('Questions', []):
-                if 'data' in file_info and not file_info['data'].empty:
-                    df_copy = file_info['data'].copy()
-                    df_copy['_team_source'] = team_name
-                    all_questions_data.append(df_copy)
-
-            # Collect comments data
-            for file_info in team_data[team_name].get('Comments', []):
-                if 'data' in file_info and not file_info['data'].empty:
-                    df_copy = file_info['data'].copy()
-                    df_copy['_team_source'] = team_name
-                    all_comments_data.append(df_copy)
+    team_names = TEAM_REGISTRY['teams']
 
     # Show overview metrics
     st.markdown("### 📊 Company Overview")
@@ -2768,11 +4292,11 @@ def show_company_wide_analysis(team_data):
                 active_teams += 1
         st.metric("Active Teams", active_teams)
     with col2:
-        st.metric("Theme Files", len(all_themes_data))
+        st.metric("Theme Files", themes_store['file_count'])
     with col3:
-        st.metric("Question Files", len(all_questions_data))
+        st.metric("Question Files", questions_store['file_count'])
     with col4:
-        st.metric("Comment Files", len(all_comments_data))
+        st.metric("Comment Files", comments_store['file_count'])
 
     # Show analysis sections
     st.markdown("---")
@@ -2786,7 +4310,7 @@ def show_company_wide_analysis(team_data):
             try:
                 with st.spinner("Generating company-wide report..."):
                     st.write(f"Debug: Team data keys: {list(team_data.keys())}")
-                    report_content = generate_company_wide_narrative_report(team_data)
+                    report_content = get_narrative_report(team_data, state=ingestion_state)
                     st.success(f"Report generated! ({len(report_content)} characters)")
                     st.text_area(
                         "Copy this report to Google Docs:",
@@ -2802,7 +4326,7 @@ def show_company_wide_analysis(team_data):
         if st.button("🔗 Create Google Doc", help="Get help creating Google Document"):
             try:
                 with st.spinner("Generating company-wide report..."):
-                    report_content = generate_company_wide_narrative_report(team_data)
+                    report_content = get_narrative_report(team_data, state=ingestion_state)
                     report_title = f"Company-Wide Survey Analysis - {pd.Timestamp.now().strftime('%B %d, %Y')}"
                     show_google_docs_integration(report_content, report_title)
             except Exception as e:
@@ -2810,7 +4334,7 @@ def show_company_wide_analysis(team_data):
                 st.exception(e)
 
     with col3:
-        report_content = generate_company_wide_narrative_report(team_data)
+        report_content = get_narrative_report(team_data, state=ingestion_state)
         report_title = f"Company-Wide Survey Analysis - {pd.Timestamp.now().strftime('%B %d, %Y')}"
         show_word_export_option(report_content, report_title)
 
@@ -2818,52 +4342,37 @@ def show_company_wide_analysis(team_data):
     company_tabs = st.tabs(["🎯 Themes Summary", "❓ Questions Summary", "💬 Comments Summary"])
 
     with company_tabs[0]:
-        show_company_wide_themes(all_themes_data, team_names)
+        show_company_wide_themes(themes_store['data'], team_names)
 
     with company_tabs[1]:
-        show_company_wide_questions(all_questions_data, team_names)
+        show_company_wide_questions(questions_store['data'], team_names)
 
     with company_tabs[2]:
-        show_company_wide_comments(all_comments_data, team_names)
+        show_company_wide_comments(comments_store['data'], team_names, comments_store['sentiment'],
+                                   comments_store['comment_index'], comments_store['inverted_index'])
 
-def show_company_wide_themes(all_themes_data, team_names):
+def show_company_wide_themes(combined_themes, team_names):
     """Show consolidated themes analysis"""
-    if not all_themes_data:
+    if combined_themes.empty:
         st.info("No themes data available across teams.")
         return
 
     st.markdown("#### 🎯 Themes Analysis Across All Teams")
 
-    # Combine all themes data
-    combined_themes = pd.concat(all_themes_data, ignore_index=True) if all_themes_data else pd.DataFrame()
-
-    if combined_themes.empty:
-        st.info("No themes data to analyze.")
-        return
-
-    # Look for theme and score columns
-    theme_col = None
-    score_col = None
-
-    for col in combined_themes.columns:
-        if any(word in col.lower() for word in ['theme', 'category', 'domain']):
-            theme_col = col
-            break
-
-    for col in combined_themes.columns:
-        if any(word in col.lower() for word in ['score', 'rating', 'value']) and not col.startswith('_'):
-            score_col = col
-            break
+    # Theme and score columns
+    roles = get_column_schema(combined_themes)['roles']
+    theme_col, score_col = roles['theme'], roles['score']
 
     if theme_col and score_col:
         try:
             # Convert scores to numeric
-            combined_themes['Score_Numeric'] = pd.to_numeric(combined_themes[score_col], errors='coerce')
-            valid_data = combined_themes.dropna(subset=['Score_Numeric', theme_col])
+            valid_data = combined_themes[[theme_col]].assign(
+                Score_Numeric=get_numeric_scores(combined_themes, score_col)
+            ).dropna(subset=['Score_Numeric', theme_col])
 
             if not valid_data.empty:
                 # Calculate average scores by theme
-                theme_scores = valid_data.groupby(theme_col)['Score_Numeric'].agg(['mean', 'count']).round(2)
+                theme_scores = valid_data.groupby(theme_col, observed=True)['Score_Numeric'].agg(['mean', 'count']).round(2)
                 theme_scores.columns = ['Average Score', 'Response Count']
                 theme_scores = theme_scores.sort_values('Average Score', ascending=False)
 
@@ -2894,90 +4403,57 @@ def show_company_wide_themes(all_themes_data, team_names):
     else:
         st.info("Themes data structure not recognized. Expected columns for 'Theme' and 'Score'.")
 
-def show_company_wide_questions(all_questions_data, team_names):
+def show_company_wide_questions(combined_questions, team_names):
     """Show consolidated questions analysis"""
-    if not all_questions_data:
+    if combined_questions.empty:
         st.info("No questions data available across teams.")
         return
 
     st.markdown("#### ❓ Questions Analysis Across All Teams")
 
-    # Combine all questions data
-    combined_questions = pd.concat(all_questions_data, ignore_index=True) if all_questions_data else pd.DataFrame()
-
-    if combined_questions.empty:
-        st.info("No questions data to analyze.")
-        return
-
     # Use the analyze_questions_data function
-    questions_data, question_col, theme_col, score_col = analyze_questions_data(combined_questions)
-
-    if questions_data:
-        # Group by theme and show summary
-        theme_summary = {}
-        for item in questions_data:
-            theme = item.get('Theme', 'Not specified')
-            if theme not in theme_summary:
-                theme_summary[theme] = {'count': 0, 'scores': []}
-            theme_summary[theme]['count'] += 1
-            if item.get('Score') and item['Score'] != "No score":
-                try:
-                    score_numeric = pd.to_numeric(item['Score'], errors='coerce')
-                    if pd.notna(score_numeric):
-                        theme_summary[theme]['scores'].append(score_numeric)
-                except:
-                    pass
+    questions_df, question_col, theme_col, score_col = analyze_questions_data(combined_questions)
 
+    if not questions_df.empty:
+        # Themes ordered by average score (lowest to highest)
         st.markdown("**Question Themes Summary (Ordered by Score):**")
-        # Sort by average score (lowest to highest)
-        themes_with_scores = []
-        for theme, data in theme_summary.items():
-            avg_score = sum(data['scores']) / len(data['scores']) if data['scores'] else 0
-            themes_with_scores.append((theme, data, avg_score))
-
-        # Sort by score (lowest first)
-        sorted_themes = sorted(themes_with_scores, key=lambda x: x[2] if x[2] > 0 else 999)
-
-        for theme, data, avg_score in sorted_themes:
+        for theme, count, avg_score in summarize_question_themes(questions_df):
             score_display = f"📊 {avg_score:.2f}" if avg_score > 0 else "📊 No scores"
             score_color = "#ef4444" if avg_score <= 2.5 else "#f59e0b" if avg_score <= 3.5 else "#10b981" if avg_score >= 4.0 else "#3b82f6"
             card_class = "warning" if avg_score <= 3.0 else "info"
             st.markdown(f"""
             <div class="tab-info-card {card_class}">
                 <strong>{theme}</strong><br>
-                <span style="color: {score_color}; font-weight: 700;">{score_display}</span> <small>({data['count']} questions)</small>
+                <span style="color: {score_color}; font-weight: 700;">{score_display}</span> <small>({count} questions)</small>
             </div>
             """, unsafe_allow_html=True)
 
-        st.markdown(f"**Total Questions Analyzed:** {len(questions_data)} across all teams")
+        st.markdown(f"**Total Questions Analyzed:** {len(questions_df)} across all teams")
     else:
         st.info("Questions data structure not recognized. Expected columns for 'Question', 'Theme', and 'Score'.")
 
-def show_company_wide_comments(all_comments_data, team_names):
-    """Show consolidated comments analysis"""
-    if not all_comments_data:
+def show_company_wide_comments(combined_comments, team_names, sentiment_partial=None, comment_index=None,
+                               inverted_index=None):
+    """Show consolidated comments analysis, reusing sentiment counts and indexes built at ingest"""
+    if combined_comments.empty:
         st.info("No comments data available across teams.")
         return
 
     st.markdown("#### 💬 Comments Analysis Across All Teams")
 
-    # Combine all comments data
-    combined_comments = pd.concat(all_comments_data, ignore_index=True) if all_comments_data else pd.DataFrame()
-
-    if combined_comments.empty:
-        st.info("No comments data to analyze.")
-        return
-
     # Use the analyze_comments_data function
-    comments_data, question_col, theme_col, comment_col = analyze_comments_data(combined_comments)
+    comments_df, question_col, theme_col, comment_col = analyze_comments_data(combined_comments)
 
-    if comments_data:
+    if not comments_df.empty:
         # Collect all comments for sentiment analysis
-        all_comments = [item['Comment'] for item in comments_data if item.get('Comment') and item['Comment'] != "No comment"]
+        all_comments = comments_df['Comment']
 
-        if all_comments:
+        if not all_comments.empty:
             # Perform company-wide sentiment analysis
-            sentiment_analysis = analyze_comment_sentiment(all_comments)
+            if sentiment_partial is not None and sentiment_partial['total_comments']:
+                sentiment_analysis = finalize_sentiment(sentiment_partial)
+            else:
+                sentiment_analysis = analyze_comment_sentiment(all_comments)
 
             # Display high-level metrics
             col1, col2, col3 = st.columns(3)
@@ -2993,11 +4469,15 @@ def show_company_wide_comments(all_comments_data, team_names):
             st.markdown("**Overall Comments Insights:**")
 
             # Create thematic insights based on sentiment analysis
-            insights = generate_comprehensive_insights(sentiment_analysis, all_comments)
+            insights = generate_comprehensive_insights(sentiment_analysis, all_comments, comment_index)
 
             for insight in insights:
                 st.markdown(f"**{insight['title']}:** {insight['description']}")
                 st.markdown("")
+
+            if inverted_index is None:
+                inverted_index = build_inverted_index(comment_index or build_comment_index(all_comments))
+            show_comment_search(comments_df, inverted_index, key='company', team_filter=True)
         else:
             st.info("No comment content found for analysis.")
     else:
@@ -3044,7 +4524,11 @@ def main():
     )
 
     if uploaded_files:
-        team_data, files_processed, processing_errors = load_and_process_multiple_files(uploaded_files)
+        # Processed files persist across reruns so only added files are parsed
+        ingestion_state = st.session_state.setdefault('ingestion_state', {})
+        team_data, files_processed, processing_errors = load_and_process_multiple_files(
+            uploaded_files, state=ingestion_state
+        )
 
         # Show processing errors if any
         if processing_errors:
@@ -3057,7 +4541,7 @@ def main():
 
         # Show file categorization summary
         total_files = len(uploaded_files)
-        successful_files = len(files_processed)
+        successful_files = len({file_info['filename'] for file_info in files_processed})
 
         st.markdown(f"""
         <div class="success-card fade-in-up">
@@ -3070,7 +4554,8 @@ def main():
         if files_processed:
             with st.expander("📁 File Categorization Summary", expanded=False):
                 for file_info in files_processed:
-                    st.markdown(f"• **{file_info['filename']}** → {file_info['team']} - {file_info['section']}")
+                    sheet_label = f" [{file_info['sheet']}]" if file_info.get('sheet') else ""
+                    st.markdown(f"• **{file_info['filename']}**{sheet_label} → {file_info['team']} - {file_info['section']}")
 
         # Navigation Layout - Two columns
         nav_col1, nav_col2 = st.columns([1, 1])
@@ -3088,7 +4573,7 @@ def main():
             st.markdown("## 🏢 Select Team")
 
             # Team Navigation - Primary navigation
-            team_names = ["Andrew's Team", 'Build Team', 'People and Marketing Team', 'Finance and Operations Team']
+            team_names = TEAM_REGISTRY['teams']
 
             # Add a default option to prevent auto-selection
             team_options = ['Select a team...'] + team_names
@@ -3106,7 +4591,7 @@ def main():
         # Show content based on selection
         if show_company_wide:
             # Show company-wide analysis
-            show_company_wide_analysis(team_data)
+            show_company_wide_analysis(team_data, ingestion_state)
         elif selected_team is None:
             # Welcome screen when no team is selected
             st.markdown("""
@@ -3175,7 +4660,7 @@ def main():
                 col1, col2, col3 = st.columns([1, 1, 1])
                 with col1:
                     if st.button(f"📋 Copy {selected_team} Text", help="Generate text report to copy/paste"):
-                        report_content = generate_team_narrative_report(selected_team, team_data[selected_team])
+                        report_content = get_narrative_report(team_data, selected_team, ingestion_state)
                         st.text_area(
                             f"Copy this {selected_team} report to Google Docs:",
                             value=report_content,
@@ -3185,12 +4670,12 @@ def main():
 
                 with col2:
                     if st.button(f"🔗 Create {selected_team} Google Doc", help="Get help creating Google Document"):
-                        report_content = generate_team_narrative_report(selected_team, team_data[selected_team])
+                        report_content = get_narrative_report(team_data, selected_team, ingestion_state)
                         report_title = f"{selected_team} Survey Analysis - {pd.Timestamp.now().strftime('%B %d, %Y')}"
                         show_google_docs_integration(report_content, report_title)
 
                 with col3:
-                    report_content = generate_team_narrative_report(selected_team, team_data[selected_team])
+                    report_content = get_narrative_report(team_data, selected_team, ingestion_state)
                     report_title = f"{selected_team} Survey Analysis - {pd.Timestamp.now().strftime('%B %d, %Y')}"
                     show_word_export_option(report_content, report_title)
 
@@ -3206,16 +4691,20 @@ def main():
                     show_team_comments_analysis(team_data, selected_team)
 
     else:
-        # Initial upload prompt with team examples
-        st.markdown("""
+        # Initial upload prompt with team examples from the registry
+        team_keywords_html = ""
+        for team, keywords in list(TEAM_REGISTRY['keywords'].items())[:10]:
+            keyword_text = " or ".join(f'"{keyword}"' for keyword in keywords)
+            team_keywords_html += f"<small>• {keyword_text} → {team}</small><br>"
+        if len(TEAM_REGISTRY['keywords']) > 10:
+            team_keywords_html += f"<small>• ...and {len(TEAM_REGISTRY['keywords']) - 10} more teams</small><br>"
+
+        st.markdown(f"""
         <div class="info-card fade-in-up">
             <strong>💡 Smart Team File Organization:</strong><br>
             Name your files to automatically assign them to teams:<br><br>
             <strong>Team Keywords:</strong><br>
-            <small>• "andrew" → Andrew's Team</small><br>
-            <small>• "build" → Build Team</small><br>
-            <small>• "people" or "marketing" → People and Marketing Team</small><br>
-            <small>• "operations" or "finance" → Finance and Operations Team</small><br><br>
+            {team_keywords_html}<br>
             <strong>Category Keywords:</strong><br>
             <small>• "themes", "topics" → Themes Analysis</small><br>
             <small>• "questions", "survey" → Questions Analysis</small><br>
@@ -3246,7 +4735,7 @@ def analyze_survey_data(df):
 
     # Analyze scores (Column B)
     if 'Score' in df.columns:
-        score_data = pd.to_numeric(df['Score'], errors='coerce').dropna()
+        score_data = get_numeric_scores(df, 'Score').dropna()
         if len(score_data) > 0:
             insights['score_analysis'] = {
                 'mean': round(score_data.mean(), 2),
@@ -3296,11 +4785,11 @@ def analyze_survey_data(df):
         valid_rows = df[['Score', 'Participation_Rate', 'Theme']].dropna()
         if len(valid_rows) > 0:
             # Find best and worst performing themes
-            score_data = pd.to_numeric(valid_rows['Score'], errors='coerce')
+            score_data = get_numeric_scores(df, 'Score').loc[valid_rows.index]
             valid_rows_with_scores = valid_rows[score_data.notna()].copy()
 
             if len(valid_rows_with_scores) > 0:
-                valid_rows_with_scores['Score_Numeric'] = pd.to_numeric(valid_rows_with_scores['Score'], errors='coerce')
+                valid_rows_with_scores['Score_Numeric'] = score_data[score_data.notna()]
                 best_theme = valid_rows_with_scores.loc[valid_rows_with_scores['Score_Numeric'].idxmax()]
                 worst_theme = valid_rows_with_scores.loc[valid_rows_with_scores['Score_Numeric'].idxmin()]
 
@@ -3425,7 +4914,7 @@ def create_survey_visualizations(df, insights):
     try:
         # Score distribution chart
         if 'Score' in df.columns:
-            score_data = pd.to_numeric(df['Score'], errors='coerce').dropna()
+            score_data = get_numeric_scores(df, 'Score').dropna()
             if len(score_data) > 0:
                 fig = px.histogram(
                     x=score_data,
@@ -3468,11 +4957,11 @@ def create_survey_visualizations(df, insights):
         if 'Score' in df.columns and 'Participation_Rate' in df.columns and 'Theme' in df.columns:
             # Prepare data for scatter plot
             scatter_data = df[['Theme', 'Score', 'Participation_Rate']].dropna()
-            scores = pd.to_numeric(scatter_data['Score'], errors='coerce')
+            scores = get_numeric_scores(df, 'Score').loc[scatter_data.index]
             scatter_data_clean = scatter_data[scores.notna()].copy()
 
             if len(scatter_data_clean) > 0:
-                scatter_data_clean['Score_Numeric'] = pd.to_numeric(scatter_data_clean['Score'])
+                scatter_data_clean['Score_Numeric'] = scores[scores.notna()]
 
                 # Convert participation to numeric
                 participation_numeric = []
@@ -3509,9 +4998,9 @@ def create_survey_visualizations(df, insights):
         # Top themes by score (if enough themes)
         if len(df) > 0 and 'Theme' in df.columns and 'Score' in df.columns:
             theme_scores = df[['Theme', 'Score']].dropna()
-            numeric_scores = pd.to_numeric(theme_scores['Score'], errors='coerce')
+            numeric_scores = get_numeric_scores(df, 'Score').loc[theme_scores.index]
             theme_scores_clean = theme_scores[numeric_scores.notna()].copy()
-            theme_scores_clean['Score_Numeric'] = pd.to_numeric(theme_scores_clean['Score'])
+            theme_scores_clean['Score_Numeric'] = numeric_scores[numeric_scores.notna()]
 
             if len(theme_scores_clean) >= 3:
                 top_themes = theme_scores_clean.nlargest(min(10, len(theme_scores_clean)), 'Score_Numeric')
@@ -0,0 +1,54 @@
+import datetime
+from io import BytesIO
+
+import openpyxl
+import pandas as pd
+import pytest
+
+import app
+
+# Columns as survey exports mix them: whole numbers come back from openpyxl as int.
+# Blanks stay off the last row, where pd.read_excel trims empty rows.
+MIXED_COLUMNS = {
+    'int_text': [4, '3', 2, 5],
+    'float_text': [4.5, '3', 2, 1],
+    'int_text_blank': [4, '3', None, 1],
+    'int_na_text': [4, 'N/A', 2, 3],
+    'int_bad_text': [4, 'x', 2, 1],
+    'float_bad_text': [1.5, '2', 3.25, 'x'],
+    'bool_int': [True, 1, 0, False],
+    'int_float': [1, 2.5, None, 3],
+    'ints': [1, 2, 3, 4],
+    'numeric_text': ['1', None, '2.5', '3'],
+    'text': ['a', 'b', None, 'c'],
+    'dates': [datetime.datetime(2024, 1, 1), None, datetime.datetime(2024, 2, 1), datetime.datetime(2024, 3, 1)]
+}
+
+def make_workbook(columns):
+    workbook = openpyxl.Workbook()
+    worksheet = workbook.active
+    worksheet.append(list(columns))
+    for row in zip(*columns.values()):
+        worksheet.append(list(row))
+    output = BytesIO()
+    workbook.save(output)
+    return output.getvalue()
+
+@pytest.mark.parametrize('column', list(MIXED_COLUMNS))
+def test_streaming_reader_matches_read_excel(column):
+    file_bytes = make_workbook({column: MIXED_COLUMNS[column]})
+    expected = pd.read_excel(BytesIO(file_bytes))
+    (streamed,) = app.read_excel_file(file_bytes, 'openpyxl-stream').values()
+    pd.testing.assert_series_equal(streamed[column], expected[column])
+
+def test_streamed_text_roles_stay_text_across_chunks():
+    # A later chunk of numeric-looking themes and comments must not be inferred as numbers
+    file_bytes = make_workbook({
+        'Affirmation': ['I feel supported'] * 4,
+        'Theme': ['Growth', 'Growth', '2024', '2024'],
+        'Comment': ['great team', 'clear goals', '5', '2024']
+    })
+    df, _ = app.parse_comments_streaming(file_bytes, chunk_rows=2)
+    assert isinstance(df['Theme'].dtype, pd.CategoricalDtype)
+    assert list(df['Theme']) == ['Growth', 'Growth', '2024', '2024']
+    assert list(df['Comment']) == ['great team', 'clear goals', '5', '2024']